@@ -0,0 +1,67 @@
+"""
+Compression ratio and throughput of the ECG block codec against zlib.
+
+Usage:
+    python -m benchmarks.bench_codec [--seconds 300] [--session data_records/sessions/<id>]
+
+Sizes are compared against 3 bytes per sample, the packed 24-bit size.
+With --session the samples of a recorded session are used instead of
+synthetic ECG.
+"""
+
+import argparse
+import zlib
+
+import numpy as np
+
+from src.data.codec import ECGBlockCodec
+from src.data.models import ECGData
+from src.data.session_store import ECGSession
+from src.utils.constants import WEBSOCKET_BUFFER_SIZE
+from .synthetic import synthetic_ecg, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=300)
+    parser.add_argument('--session', help='Recorded session directory to use instead of synthetic data')
+    args = parser.parse_args()
+
+    if args.session:
+        session = ECGSession(args.session)
+        block = np.rint(session.read_window(0, session.sample_count)).astype(np.int64)
+    else:
+        block = synthetic_ecg(args.seconds).astype(np.int64)
+    raw_size = block.size * 3
+    print(f"{block.shape[0]} channels x {block.shape[1]} samples, {raw_size / 1e6:.2f} MB as 24-bit")
+    print(f"{'method':<16}{'ratio':>8}{'encode MB/s':>14}{'decode MB/s':>14}")
+
+    for order in (0, 1, 2):
+        codec = ECGBlockCodec(order)
+        packet = codec.encode(block)
+        assert np.array_equal(codec.decode(packet), block)
+        encode = timed(lambda: codec.encode(block))
+        decode = timed(lambda: codec.decode(packet))
+        print(f"{f'codec order {order}':<16}{raw_size / len(packet):>8.2f}"
+              f"{raw_size / encode / 1e6:>14.0f}{raw_size / decode / 1e6:>14.0f}")
+
+    packed = np.ascontiguousarray(block.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3]).tobytes()
+    for level in (1, 6, 9):
+        compressed = zlib.compress(packed, level)
+        encode = timed(lambda: zlib.compress(packed, level))
+        decode = timed(lambda: zlib.decompress(compressed))
+        print(f"{f'zlib level {level}':<16}{raw_size / len(compressed):>8.2f}"
+              f"{raw_size / encode / 1e6:>14.0f}{raw_size / decode / 1e6:>14.0f}")
+
+    # One uplink chunk, as sent by the BLE worker
+    chunk = ECGData(block[:, :WEBSOCKET_BUFFER_SIZE].astype(float))
+    codec = ECGBlockCodec()
+    packet = chunk.to_compressed(codec)
+    round_trip = timed(lambda: codec.decode(chunk.to_compressed(codec)), repeat=200)
+    print(f"\nuplink chunk of {WEBSOCKET_BUFFER_SIZE} samples: codec {len(packet)} B, "
+          f"float32 {len(chunk.to_bytes())} B, JSON {len(chunk.to_json(WEBSOCKET_BUFFER_SIZE))} B, "
+          f"encode+decode {round_trip * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Session export throughput and file size against the per-channel text records.
+
+Usage:
+    python -m benchmarks.bench_export [--minutes 60]
+
+Records a synthetic session in a temporary directory. The same samples
+are then written in the ECGFileManager text format and exported to
+Parquet, HDF5 (when PyTables is installed) and the codec format. Each
+format runs in its own process; its peak RSS is taken right after the
+export, before reading back, to show memory stays bounded by the export
+chunk rather than the session length. The text "read" column is the
+ECGFileManager read path scaled to all channels.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.data.exporter import ECGSessionExporter
+from src.data.file_manager import ECGFileManager
+from src.data.session_store import ECGSession
+from src.utils.constants import DATA_RECORD_DIR, EXPORT_CHUNK_SAMPLES
+from .measure import run_isolated, peak_rss_mb
+from .synthetic import synthetic_session
+
+
+def export_text(session_dir: str) -> dict:
+    """Write the session as the eight text record files, one chunk at a time."""
+    session = ECGSession(session_dir)
+    file_manager = ECGFileManager()
+    start = time.perf_counter()
+    for offset in range(0, session.sample_count, EXPORT_CHUNK_SAMPLES):
+        window = session.read_window(offset, EXPORT_CHUNK_SAMPLES)
+        for channel in range(session.channels):
+            file_manager.write_channel_data(channel + 1, window[channel])
+    elapsed = time.perf_counter() - start
+    export_rss = peak_rss_mb()
+    size = sum(os.path.getsize(os.path.join(DATA_RECORD_DIR, name)) for name in os.listdir(DATA_RECORD_DIR))
+
+    # Reading back the way reports do, for a single channel
+    start = time.perf_counter()
+    file_manager.read_last_channel_values(1, session.sample_count)
+    read = time.perf_counter() - start
+    return {'seconds': elapsed, 'bytes': size, 'read_seconds': read * session.channels,
+            'export_rss_mb': export_rss}
+
+
+def export_format(session_dir: str, method: str) -> dict:
+    """Export the session with one ECGSessionExporter method and read it back."""
+    session = ECGSession(session_dir)
+    exporter = ECGSessionExporter()
+    # Keep library import time out of the measurement
+    if method == 'export_parquet':
+        import pyarrow.parquet  # noqa: F401
+    elif method == 'export_hdf5':
+        import pandas  # noqa: F401
+    start = time.perf_counter()
+    path = getattr(exporter, method)(session)
+    elapsed = time.perf_counter() - start
+    export_rss = peak_rss_mb()
+
+    start = time.perf_counter()
+    if method == 'export_parquet':
+        import pyarrow.parquet as pq
+        pq.read_table(path)
+    elif method == 'export_hdf5':
+        import pandas as pd
+        pd.read_hdf(path, 'ecg')
+    else:
+        for _ in exporter.iter_codec_file(path):
+            pass
+    read = time.perf_counter() - start
+    return {'seconds': elapsed, 'bytes': os.path.getsize(path), 'read_seconds': read,
+            'export_rss_mb': export_rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--minutes', type=float, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        session = synthetic_session(os.path.join(workdir, 'sessions'), args.minutes * 60)
+        samples = session.sample_count * session.channels
+        print(f"{args.minutes:g} min session, {session.channels} channels x {session.sample_count} samples")
+
+        runs = [('text', export_text, ()), ('parquet', export_format, ('export_parquet',))]
+        try:
+            import tables  # noqa: F401
+            runs.append(('hdf5', export_format, ('export_hdf5',)))
+        except ImportError:
+            print("PyTables not installed, skipping HDF5")
+        runs.append(('codec', export_format, ('export_codec',)))
+
+        print(f"{'format':<10}{'write s':>9}{'MS/s':>8}{'size MB':>9}{'read s':>8}{'export RSS MB':>15}")
+
+        for name, function, extra in runs:
+            result = run_isolated(function, session.session_dir, *extra, workdir=workdir)
+            if 'error' in result:
+                print(f"{name:<10}failed: {result['error']}")
+                continue
+            print(f"{name:<10}{result['seconds']:>9.2f}{samples / result['seconds'] / 1e6:>8.1f}"
+                  f"{result['bytes'] / 1e6:>9.1f}{result['read_seconds']:>8.2f}{result['export_rss_mb']:>15.0f}")
+
+
+if __name__ == '__main__':
+    main()
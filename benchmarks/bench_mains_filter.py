@@ -0,0 +1,92 @@
+"""
+Per-frame cost of mains noise monitoring and notch filtering against a budget.
+
+Usage:
+    python -m benchmarks.bench_mains_filter [--seconds 60] [--mains 50] [--hum 300]
+                                            [--budget-us 500]
+
+Adds a hum of the given frequency and amplitude (ADC counts) to a
+synthetic recording and feeds it as SAMPLES_PER_BUFFER-sample frames
+through MainsNoiseMonitor and MainsNotchFilter the way BLEWorker does.
+The notch starts on MAINS_DEFAULT_FREQUENCY, so a 50 Hz hum also
+exercises the retune. Exits with status 1 if the p99 cost per frame is
+over budget, the hum frequency is not detected or the hum left after
+the first 10 seconds is not at least 20 dB down.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from src.bluetooth.mains_filter import MainsNotchFilter, MainsNoiseMonitor
+from src.utils.constants import SAMPLES_PER_BUFFER, SAMPLING_RATE, MAINS_FREQUENCIES
+from .synthetic import synthetic_ecg
+
+SETTLE_SECONDS = 10
+MIN_ATTENUATION_DB = 20
+
+
+def tone_amplitude(signal: np.ndarray, frequency: float) -> np.ndarray:
+    """Amplitude of one frequency in every channel, by lock-in against a complex tone."""
+    t = np.arange(signal.shape[1]) / SAMPLING_RATE
+    return 2 * np.abs(signal @ np.exp(-2j * np.pi * frequency * t)) / signal.shape[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--mains', type=int, choices=MAINS_FREQUENCIES, default=50)
+    parser.add_argument('--hum', type=float, default=300)
+    parser.add_argument('--budget-us', type=float, default=500)
+    args = parser.parse_args()
+
+    clean = synthetic_ecg(args.seconds)
+    t = np.arange(clean.shape[1]) / SAMPLING_RATE
+    phases = np.linspace(0, np.pi, clean.shape[0])[:, np.newaxis]
+    signal = clean + args.hum * np.sin(2 * np.pi * args.mains * t + phases)
+
+    monitor = MainsNoiseMonitor()
+    notch = MainsNotchFilter()
+    filtered = np.empty_like(signal)
+    costs = []
+    for start in range(0, signal.shape[1] - SAMPLES_PER_BUFFER + 1, SAMPLES_PER_BUFFER):
+        frame = signal[:, start:start + SAMPLES_PER_BUFFER]
+        begin = time.perf_counter()
+        if monitor.update(frame):
+            notch.set_frequency(monitor.frequency)
+        filtered[:, start:start + SAMPLES_PER_BUFFER] = notch.process(frame)
+        costs.append(time.perf_counter() - begin)
+
+    costs = np.array(costs) * 1e6
+    median, p99 = np.percentile(costs, [50, 99])
+    settled = slice(SETTLE_SECONDS * SAMPLING_RATE, len(costs) * SAMPLES_PER_BUFFER)
+    hum_in = tone_amplitude(signal[:, settled], args.mains)
+    # The notch removes the ECG's own content at that frequency too, so all of this is hum
+    hum_out = tone_amplitude(filtered[:, settled], args.mains)
+    attenuation = 20 * np.log10(hum_in / np.maximum(hum_out, 1e-9))
+
+    print(f"{len(costs)} frames of {SAMPLES_PER_BUFFER} samples, {args.hum:g} count {args.mains} Hz hum")
+    print(f"us per frame: median {median:.1f} p99 {p99:.1f} max {costs.max():.1f} (budget {args.budget_us:g})")
+    print(f"detected {monitor.frequency} Hz, noise RMS {np.array2string(monitor.noise, precision=0)}"
+          f" (hum RMS {args.hum / np.sqrt(2):.0f})")
+    print(f"hum after {SETTLE_SECONDS} s: {np.array2string(hum_out, precision=1)} counts, "
+          f"attenuation {attenuation.min():.1f} to {attenuation.max():.1f} dB")
+
+    failed = False
+    if monitor.frequency != args.mains:
+        print("mains frequency not detected")
+        failed = True
+    if attenuation.min() < MIN_ATTENUATION_DB:
+        print(f"hum attenuated less than {MIN_ATTENUATION_DB} dB")
+        failed = True
+    if p99 > args.budget_us:
+        print("over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Median beat analysis time for 12 leads over windows from 10 s to 5 min.
+
+Usage:
+    python -m benchmarks.bench_median_beats [--budget-s 0.5]
+
+Derives and filters the 12 leads from a synthetic 72 bpm recording,
+then times MedianBeatAnalyzer.analyze on each window. The detected
+heart rate is checked against the synthetic one, and the script exits
+with status 1 if any window is over budget.
+"""
+
+import argparse
+import sys
+
+from src.bluetooth.beat_analysis import MedianBeatAnalyzer
+from src.bluetooth.data_processor import ECGDataProcessor
+from src.utils.constants import ECG_LEADS, SAMPLING_RATE
+from .synthetic import synthetic_ecg, timed
+
+WINDOW_SECONDS = (10, 30, 60, 300)
+# synthetic_ecg beats at 1.2 Hz
+EXPECTED_HEART_RATE = 72
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--budget-s', type=float, default=0.5)
+    args = parser.parse_args()
+
+    processor = ECGDataProcessor()
+    analyzer = MedianBeatAnalyzer()
+    samples = synthetic_ecg(max(WINDOW_SECONDS))
+
+    print(f"{'window s':>9}{'leads ms':>10}{'analyze ms':>12}{'beats':>7}{'bpm':>6}")
+    failed = False
+    for seconds in WINDOW_SECONDS:
+        window = samples[:, :seconds * SAMPLING_RATE]
+        channel_data = {f'channel{i + 1}': channel for i, channel in enumerate(window)}
+        lead_time = timed(lambda: [processor.get_lead_data(lead, channel_data) for lead in ECG_LEADS])
+        lead_data = {lead: processor.get_lead_data(lead, channel_data) for lead in ECG_LEADS}
+
+        result = analyzer.analyze(lead_data)
+        elapsed = timed(lambda: analyzer.analyze(lead_data))
+        print(f"{seconds:>9}{lead_time * 1e3:>10.1f}{elapsed * 1e3:>12.1f}"
+              f"{result.beat_count:>7}{result.heart_rate:>6.0f}")
+
+        if abs(result.heart_rate - EXPECTED_HEART_RATE) > 2:
+            print(f"heart rate {result.heart_rate:.1f}, expected {EXPECTED_HEART_RATE}")
+            failed = True
+        if elapsed > args.budget_s:
+            print(f"over budget ({args.budget_s:g} s)")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
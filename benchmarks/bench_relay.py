@@ -0,0 +1,148 @@
+"""
+Relay fan-out latency and CPU cost with many local viewers.
+
+Usage:
+    python -m benchmarks.bench_relay [--clients 50] [--seconds 30] [--decimation 1]
+                                     [--budget-ms 50]
+
+Starts ECGRelayServer on a free loopback port with a token, connects
+the clients from a separate process and publishes one
+SAMPLES_PER_BUFFER-sample frame per acquisition period, like BLEWorker
+does. Latency is the time from publish() to each client receiving the
+frame. The relay thread's CPU time is read from /proc on Linux. Exits
+with status 1 if the p99 latency is over budget or any frame is lost.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import websockets
+
+from src.bluetooth.relay_server import ECGRelayServer
+from src.utils.constants import SAMPLES_PER_BUFFER, SAMPLING_RATE
+from .synthetic import synthetic_ecg
+
+BENCH_TOKEN = 'bench'
+# Seconds a client waits for the next frame before giving up on the rest
+RECEIVE_TIMEOUT = 5
+
+
+def free_port() -> int:
+    """Get a loopback port nothing is listening on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def receive_frames(url: str, clients: int, frames: int, ready) -> list:
+    """Connect all clients, then record the arrival time of every frame on each."""
+    connections = [await websockets.connect(url) for _ in range(clients)]
+    ready.set()
+
+    async def receive(connection):
+        arrivals = []
+        try:
+            for _ in range(frames):
+                await asyncio.wait_for(connection.recv(), RECEIVE_TIMEOUT)
+                arrivals.append(time.time())
+        except asyncio.TimeoutError:
+            pass  # Frames were dropped, the caller sees a short list
+        await connection.close()
+        return arrivals
+
+    return await asyncio.gather(*(receive(connection) for connection in connections))
+
+
+def run_clients(url: str, clients: int, frames: int, ready, results):
+    """Client process entry point."""
+    results.put(asyncio.run(receive_frames(url, clients, frames, ready)))
+
+
+async def native_thread_id() -> int:
+    """Kernel id of the thread running the current event loop."""
+    return threading.get_native_id()
+
+
+def thread_cpu_seconds(native_id: int) -> float:
+    """User plus system CPU time of a thread of this process, from /proc."""
+    with open(f'/proc/self/task/{native_id}/stat') as file:
+        # Fields after the parenthesized command name, utime and stime are fields 14 and 15
+        fields = file.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--decimation', type=int, default=1)
+    parser.add_argument('--budget-ms', type=float, default=50)
+    args = parser.parse_args()
+
+    relay = ECGRelayServer('127.0.0.1', free_port(), BENCH_TOKEN)
+    relay.start()
+    while relay.loop is None:
+        if relay.isFinished():
+            sys.exit("relay did not start")
+        time.sleep(0.01)
+    # The relay loop thread's kernel id, for its CPU time
+    native_id = asyncio.run_coroutine_threadsafe(native_thread_id(), relay.loop).result()
+
+    samples = synthetic_ecg(args.seconds)
+    frames = samples.shape[1] // SAMPLES_PER_BUFFER
+    period = SAMPLES_PER_BUFFER / SAMPLING_RATE
+
+    context = multiprocessing.get_context('spawn')
+    ready, results = context.Event(), context.Queue()
+    url = f'ws://127.0.0.1:{relay.port}/?token={BENCH_TOKEN}&decimation={args.decimation}'
+    process = context.Process(target=run_clients, args=(url, args.clients, frames, ready, results))
+    process.start()
+    ready.wait()
+    while len(relay.subscribers) < args.clients:
+        time.sleep(0.01)
+    # Subscribers leave the set on disconnect, keep them for their drop counts
+    subscribers = list(relay.subscribers)
+
+    has_proc = sys.platform.startswith('linux')
+    cpu_start = thread_cpu_seconds(native_id) if has_proc else None
+    publish_times = []
+    start = time.perf_counter()
+    for k in range(frames):
+        # Pace on the acquisition clock, not on the previous publish
+        time.sleep(max(0.0, start + k * period - time.perf_counter()))
+        publish_times.append(time.time())
+        relay.publish(samples[:, k * SAMPLES_PER_BUFFER:(k + 1) * SAMPLES_PER_BUFFER])
+    arrivals = results.get()
+    elapsed = time.perf_counter() - start
+    cpu = thread_cpu_seconds(native_id) - cpu_start if has_proc else None
+    dropped = sum(subscriber.dropped for subscriber in subscribers)
+    process.join()
+    relay.stop()
+    relay.wait()
+
+    # Latency needs the k-th arrival to be the k-th frame, so only complete clients count
+    complete = [client for client in arrivals if len(client) == frames]
+    lost = frames * args.clients - sum(len(client) for client in arrivals)
+    if not complete:
+        sys.exit(f"no client received every frame, {lost} frames lost")
+    latencies = (np.array(complete) - np.array(publish_times)) * 1e3
+    median, p99 = np.percentile(latencies, [50, 99])
+    print(f"{args.clients} clients, decimation {args.decimation}, {frames} frames every {period * 1e3:.0f} ms")
+    print(f"latency ms: median {median:.1f} p99 {p99:.1f} max {latencies.max():.1f} (budget {args.budget_ms:g})")
+    if cpu is not None:
+        print(f"relay thread CPU: {cpu:.2f} s in {elapsed:.1f} s ({100 * cpu / elapsed:.1f}% of a core)")
+    print(f"dropped frames: {dropped}, lost frames: {lost}")
+
+    if dropped or lost or p99 > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
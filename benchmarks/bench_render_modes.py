@@ -0,0 +1,59 @@
+"""
+12-lead report generation time and PDF size for every render mode.
+
+Usage:
+    python -m benchmarks.bench_render_modes [--repeat 3] [--median-beats | --no-median-beats]
+
+Each mode runs in its own process. The first report includes font and
+grid setup, later reports show the steady per-report cost of the
+running app. Run from the repository root so the report assets load.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.data.models import PatientData
+from src.plotting.ecg_plots import ECGReportGenerator, RENDER_MODES
+from src.utils.constants import ECG_CHANNEL_COUNT, SAMPLING_RATE, MEDIAN_BEAT_ENABLED
+from .measure import run_isolated
+from .synthetic import synthetic_ecg
+
+
+def render_reports(render_mode: str, median_beats: bool, repeat: int, output_dir: str) -> dict:
+    """Render the same 12-lead report several times with one generator."""
+    generator = ECGReportGenerator(render_mode=render_mode, median_beats=median_beats)
+    samples = synthetic_ecg(generator.sample_count / SAMPLING_RATE)
+    channel_data = {f'channel{i + 1}': samples[i] for i in range(ECG_CHANNEL_COUNT)}
+    patient_data = PatientData(first_name="Ana", last_name="Pérez")
+    path = os.path.join(output_dir, f'{render_mode}.pdf')
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generator.generate_report(path, channel_data, patient_data)
+        times.append(time.perf_counter() - start)
+    return {'first': times[0], 'warm': min(times[1:] or times), 'bytes': os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--median-beats', action=argparse.BooleanOptionalAction, default=MEDIAN_BEAT_ENABLED)
+    args = parser.parse_args()
+
+    print(f"median beats {'on' if args.median_beats else 'off'}")
+    print(f"{'mode':<11}{'first s':>9}{'warm s':>8}{'PDF KB':>8}{'peak RSS MB':>13}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for render_mode in RENDER_MODES:
+            result = run_isolated(render_reports, render_mode, args.median_beats, args.repeat, output_dir)
+            if 'error' in result:
+                print(f"{render_mode:<11}failed: {result['error']}")
+                continue
+            print(f"{render_mode:<11}{result['first']:>9.2f}{result['warm']:>8.2f}"
+                  f"{result['bytes'] / 1e3:>8.0f}{result['peak_rss_mb']:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
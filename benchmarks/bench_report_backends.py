@@ -0,0 +1,79 @@
+"""
+12-lead report cost of the Qt engine against the matplotlib one.
+
+Usage:
+    python -m benchmarks.bench_report_backends [--repeat 5] [--median-beats | --no-median-beats]
+
+Each backend runs in a fresh process, so the import column is the cost
+the app pays on first use (with the shared signal analysis modules
+already loaded) and peak RSS is the backend's own. The matplotlib
+engine uses the default render mode. Qt runs on the offscreen platform
+unless QT_QPA_PLATFORM is set. Run from the repository root so the
+report assets load.
+"""
+
+import argparse
+import importlib
+import os
+import tempfile
+import time
+
+from src.data.models import PatientData
+from src.utils.constants import ECG_CHANNEL_COUNT, SAMPLING_RATE, MEDIAN_BEAT_ENABLED, REPORT_RENDER_MODE
+from .measure import run_isolated
+from .synthetic import synthetic_ecg
+
+BACKEND_MODULES = {'matplotlib': 'src.plotting.ecg_plots', 'qt': 'src.plotting.qt_report'}
+
+
+def render_reports(backend: str, median_beats: bool, repeat: int, output_dir: str) -> dict:
+    """Import one report engine and render the same report several times."""
+    # The app has the analysis modules loaded already, count only the engine's own imports
+    import src.bluetooth.beat_analysis  # noqa: F401
+    import src.bluetooth.data_processor  # noqa: F401
+    start = time.perf_counter()
+    module = importlib.import_module(BACKEND_MODULES[backend])
+    import_time = time.perf_counter() - start
+
+    if backend == 'qt':
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication([])  # noqa: F841, fonts and QPdfWriter need an application
+        generator = module.QtReportGenerator(median_beats=median_beats)
+    else:
+        generator = module.ECGReportGenerator(median_beats=median_beats)
+
+    samples = synthetic_ecg(generator.sample_count / SAMPLING_RATE)
+    channel_data = {f'channel{i + 1}': samples[i] for i in range(ECG_CHANNEL_COUNT)}
+    patient_data = PatientData(first_name="Ana", last_name="Pérez")
+    path = os.path.join(output_dir, f'{backend}.pdf')
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        generator.generate_report(path, channel_data, patient_data)
+        times.append(time.perf_counter() - start)
+    return {'import': import_time, 'first': times[0], 'warm': min(times[1:] or times),
+            'bytes': os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--median-beats', action=argparse.BooleanOptionalAction, default=MEDIAN_BEAT_ENABLED)
+    args = parser.parse_args()
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    print(f"median beats {'on' if args.median_beats else 'off'}, matplotlib render mode {REPORT_RENDER_MODE}")
+    print(f"{'backend':<12}{'import s':>9}{'first s':>9}{'warm s':>8}{'PDF KB':>8}{'peak RSS MB':>13}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for backend in BACKEND_MODULES:
+            result = run_isolated(render_reports, backend, args.median_beats, args.repeat, output_dir)
+            if 'error' in result:
+                print(f"{backend:<12}failed: {result['error']}")
+                continue
+            print(f"{backend:<12}{result['import']:>9.2f}{result['first']:>9.2f}{result['warm']:>8.2f}"
+                  f"{result['bytes'] / 1e3:>8.0f}{result['peak_rss_mb']:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
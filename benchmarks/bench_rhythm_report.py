@@ -0,0 +1,69 @@
+"""
+Rhythm report generation time and peak RSS for a long recording.
+
+Usage:
+    python -m benchmarks.bench_rhythm_report [--minutes 60] [--render-mode decimated]
+                                             [--budget-s 60] [--budget-rss-mb 400]
+
+Records a synthetic session and renders the whole of it as a rhythm
+report (120 pages per hour), each run in its own process. A short
+report of the first ten pages is rendered too, so the output shows
+whether peak RSS grows with the page count. Exits with status 1 if
+the full report is over either budget.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from src.data.session_store import ECGSession
+from src.plotting.ecg_plots import ECGReportGenerator, RENDER_MODES
+from src.utils.constants import REPORT_RENDER_MODE, RHYTHM_STRIP_SECONDS, RHYTHM_STRIPS_PER_PAGE
+from .measure import run_isolated
+from .synthetic import synthetic_session
+
+
+def render_report(session_dir: str, render_mode: str, count: int) -> dict:
+    """Render the first count samples of the session as a rhythm report."""
+    session = ECGSession(session_dir)
+    generator = ECGReportGenerator(render_mode=render_mode)
+    path = os.path.join(os.path.dirname(session_dir), f'rhythm-{count}.pdf')
+    start = time.perf_counter()
+    generator.generate_rhythm_report(path, session, 0, count)
+    return {'seconds': time.perf_counter() - start, 'bytes': os.path.getsize(path)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--minutes', type=float, default=60)
+    parser.add_argument('--render-mode', choices=RENDER_MODES, default=REPORT_RENDER_MODE)
+    parser.add_argument('--budget-s', type=float, default=60)
+    parser.add_argument('--budget-rss-mb', type=float, default=400)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        session = synthetic_session(os.path.join(workdir, 'sessions'), args.minutes * 60)
+        page_samples = RHYTHM_STRIP_SECONDS * RHYTHM_STRIPS_PER_PAGE * session.sampling_rate
+        print(f"{args.minutes:g} min session, render mode {args.render_mode}")
+        print(f"{'pages':>6}{'time s':>9}{'s/page':>8}{'PDF MB':>8}{'peak RSS MB':>13}")
+
+        result = None
+        for count in (10 * page_samples, session.sample_count):
+            result = run_isolated(render_report, session.session_dir, args.render_mode, count,
+                                  workdir=workdir)
+            if 'error' in result:
+                print(f"failed: {result['error']}")
+                sys.exit(1)
+            pages = -(-min(count, session.sample_count) // page_samples)
+            print(f"{pages:>6}{result['seconds']:>9.2f}{result['seconds'] / pages:>8.3f}"
+                  f"{result['bytes'] / 1e6:>8.1f}{result['peak_rss_mb']:>13.0f}")
+
+    if result['seconds'] > args.budget_s or result['peak_rss_mb'] > args.budget_rss_mb:
+        print(f"over budget ({args.budget_s:g} s, {args.budget_rss_mb:g} MB)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Per-frame cost of the signal quality stage against a microsecond budget.
+
+Usage:
+    python -m benchmarks.bench_signal_quality [--seconds 60] [--budget-us 100]
+
+Feeds SAMPLES_PER_BUFFER-sample frames through SignalQualityMonitor the
+way BLEWorker does (update, then statuses) and exits with status 1 if
+the median cost per frame is over budget. One lead of each fault type is
+included so every code path runs, and the detected statuses are checked.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from src.bluetooth.signal_quality import (SignalQualityMonitor, QUALITY_OK, QUALITY_FLATLINE,
+                                         QUALITY_SATURATED, QUALITY_NOISY)
+from src.utils.constants import SAMPLES_PER_BUFFER
+from .synthetic import synthetic_ecg
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--budget-us', type=float, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = synthetic_ecg(args.seconds)
+    raw = np.zeros_like(frames)
+    n = frames.shape[1]
+    frames[1] = rng.normal(0, 3, n)                         # electrode off: flat
+    frames[2] = 15900 + rng.normal(0, 50, n)                # drifted onto the plot limit
+    frames[3] += rng.normal(0, 1500, n)                     # muscle noise
+    frames[4] = rng.normal(0, 1, n)                         # ADC on the 24-bit rail
+    raw[4] = 2 ** 23 - 1
+    expected = [QUALITY_OK, QUALITY_FLATLINE, QUALITY_SATURATED, QUALITY_NOISY, QUALITY_SATURATED,
+                QUALITY_OK, QUALITY_OK, QUALITY_OK]
+
+    monitor = SignalQualityMonitor()
+    costs = []
+    for start in range(0, n - SAMPLES_PER_BUFFER + 1, SAMPLES_PER_BUFFER):
+        frame = frames[:, start:start + SAMPLES_PER_BUFFER]
+        raw_frame = raw[:, start:start + SAMPLES_PER_BUFFER]
+        begin = time.perf_counter()
+        monitor.update(frame, raw_frame)
+        statuses = monitor.statuses()
+        costs.append(time.perf_counter() - begin)
+
+    costs = np.array(costs) * 1e6
+    median, p99 = np.percentile(costs, [50, 99])
+    print(f"{len(costs)} frames of {SAMPLES_PER_BUFFER} samples")
+    print(f"us per frame: median {median:.1f} p99 {p99:.1f} max {costs.max():.1f} (budget {args.budget_us:.0f})")
+    print(f"statuses: {statuses}")
+
+    if statuses != expected:
+        print(f"unexpected statuses, expected {expected}")
+        sys.exit(1)
+    if median > args.budget_us:
+        print("over budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Process-isolated measurement helpers shared by the benchmarks."""
+
+import multiprocessing
+import os
+import resource
+import sys
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_child(queue, function, args, workdir):
+    if workdir:
+        os.chdir(workdir)
+    try:
+        result = function(*args)
+        result['peak_rss_mb'] = peak_rss_mb()
+        queue.put(result)
+    except Exception as e:
+        queue.put({'error': repr(e)})
+
+
+def run_isolated(function, *args, workdir: str = None) -> dict:
+    """
+    Run a measurement in a fresh interpreter so imports and peak RSS are its own.
+
+    Parameters:
+    function: Module-level function returning a dict of results
+    args: Arguments for the function
+    workdir (str): Working directory for the child, for the repo's relative data paths
+
+    Returns:
+    dict: The function's results plus 'peak_rss_mb', or {'error': ...}
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_run_child, args=(queue, function, args, workdir))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
@@ -0,0 +1,67 @@
+"""Synthetic ECG signals shared by the benchmarks."""
+
+import numpy as np
+
+from src.utils.constants import SAMPLING_RATE, ECG_CHANNEL_COUNT
+
+
+def synthetic_ecg(seconds: float, channels: int = ECG_CHANNEL_COUNT, noise: float = 4.0,
+                  seed: int = 0) -> np.ndarray:
+    """
+    Generate ECG-like samples in ADC counts.
+
+    Parameters:
+    seconds (float): Duration of the signal
+    channels (int): Number of channels
+    noise (float): Standard deviation of the added white noise
+    seed (int): Random seed
+
+    Returns:
+    np.ndarray: Integer-valued float samples with shape (channels, n)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLING_RATE)) / SAMPLING_RATE
+    phase = (t * 1.2) % 1
+    beat = (2400 * np.exp(-((phase - 0.3) / 0.012) ** 2) - 300 * np.exp(-((phase - 0.27) / 0.01) ** 2)
+            + 500 * np.exp(-((phase - 0.55) / 0.04) ** 2) + 150 * np.exp(-((phase - 0.15) / 0.03) ** 2))
+    return np.stack([
+        np.rint(beat * (0.5 + 0.15 * k) + 200 * np.sin(2 * np.pi * 0.2 * t + k) + rng.normal(0, noise, t.size))
+        for k in range(channels)
+    ])
+
+
+def timed(function, repeat: int = 3) -> float:
+    """Best wall time of several calls in seconds."""
+    import time
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def synthetic_session(root_dir: str, seconds: float, start_time: float = 1e9, **ecg_options):
+    """
+    Record a synthetic session, one second per append.
+
+    Parameters:
+    root_dir (str): Session store directory
+    seconds (float): Duration of the recording
+    start_time (float): Wall clock time of the first sample
+    ecg_options: Passed on to synthetic_ecg
+
+    Returns:
+    ECGSession: The recorded session
+    """
+    from src.data.session_store import ECGSessionStore
+
+    session = ECGSessionStore(root_dir).create_session()
+    # Generate in ten minute blocks to keep memory bounded for long recordings
+    block_seconds = 600
+    for block_start in range(0, int(seconds), block_seconds):
+        block = synthetic_ecg(min(block_seconds, seconds - block_start), seed=block_start, **ecg_options)
+        for offset in range(0, block.shape[1], SAMPLING_RATE):
+            session.append(block[:, offset:offset + SAMPLING_RATE].T,
+                           timestamp=start_time + block_start + offset / SAMPLING_RATE)
+    return session
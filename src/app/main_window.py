@@ -1,19 +1,27 @@
 """Main application window."""
 
+import threading
+import time
 import numpy as np
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QGridLayout, QLabel, QAction, QMessageBox)
-from PyQt5.QtGui import QPixmap, QFont, QDesktopServices
+                             QGridLayout, QLabel, QAction, QMessageBox, QProgressDialog)
+from PyQt5.QtGui import QPixmap, QFont, QDesktopServices, QKeySequence
 from PyQt5.QtCore import Qt, QTimer, pyqtSlot, QUrl
 import pyqtgraph as pg
 
 from ..ui.dialogs import PatientDataForm, DeviceConnectionDialog
+from ..ui.history_view import SessionHistoryDialog
 from ..bluetooth.ble_worker import BLEWorker
-from ..plotting.ecg_plots import ECGReportGenerator
+from ..bluetooth.relay_server import ECGRelayServer
 from ..data.file_manager import ECGFileManager
+from ..data.session_store import ECGSessionStore
+from ..data.exporter import ECGSessionExporter
 from ..data.models import PatientData
+from .profiler import SamplingProfiler, ProfiledThread
+from .session_task import SessionTaskWorker
 from ..utils.constants import (TARGET_ADDRESS, CHANNEL_UUIDS, PLOT_UPDATE_INTERVAL,
-                              PLOT_LIMITS, LOGO_CUT_PATH)
+                              PLOT_LIMITS, LOGO_CUT_PATH, RELAY_ENABLED, REPORT_BACKEND,
+                              PROFILER_DURATION, QUALITY_BAD_BACKGROUND, SAMPLING_RATE)
 
 
 class AppMainWindow(QMainWindow):
@@ -24,12 +32,20 @@ class AppMainWindow(QMainWindow):
         self.device_connection_dialog = DeviceConnectionDialog()
         self.patient_data = PatientData()
         self.file_manager = ECGFileManager()
-        self.report_generator = ECGReportGenerator()
+        self.session_store = ECGSessionStore()
+        self.report_generator = self.create_report_generator(REPORT_BACKEND)
+        self.rhythm_report_generator = None
+        self.exporter = ECGSessionExporter()
+        self.session_task = None
+        self.session_task_progress = None
         self.ble_worker = None
+        self.relay = None
+        self.profiler = None
         
         self.setup_ui()
         self.setup_plots()
         self.setup_timer()
+        self.start_relay()
         self.scan_devices()
     
     def setup_ui(self):
@@ -54,6 +70,12 @@ class AppMainWindow(QMainWindow):
         
         # Create toolbar
         self.create_toolbar()
+        
+        # Signal quality and powerline noise indicators
+        self.quality_label = QLabel('')
+        self.statusBar().addPermanentWidget(self.quality_label)
+        self.mains_label = QLabel('')
+        self.statusBar().addPermanentWidget(self.mains_label)
     
     def setup_header(self):
         """Set up the header with title and logo."""
@@ -131,6 +153,40 @@ class AppMainWindow(QMainWindow):
         report_action.triggered.connect(self.generate_report)
         self.toolbar.addAction(report_action)
 
+        # Report backend action
+        qt_backend_action = QAction('Motor de Reportes Qt', self)
+        qt_backend_action.setCheckable(True)
+        qt_backend_action.setChecked(REPORT_BACKEND == 'qt')
+        qt_backend_action.toggled.connect(self.select_report_backend)
+        self.toolbar.addAction(qt_backend_action)
+
+        # Session history action
+        history_action = QAction('Historial', self)
+        history_action.triggered.connect(self.show_history)
+        self.toolbar.addAction(history_action)
+
+        # Profiler capture action
+        profile_action = QAction(f'Perfilar ({PROFILER_DURATION} s)', self)
+        profile_action.setShortcut(QKeySequence('Ctrl+Shift+P'))
+        profile_action.triggered.connect(self.start_profiler)
+        self.toolbar.addAction(profile_action)
+
+    @staticmethod
+    def create_report_generator(backend: str):
+        """Create the 12-lead report generator for a backend, importing it only when needed."""
+        if backend == 'qt':
+            from ..plotting.qt_report import QtReportGenerator
+            return QtReportGenerator()
+        if backend == 'matplotlib':
+            from ..plotting.ecg_plots import ECGReportGenerator
+            return ECGReportGenerator()
+        raise ValueError(f"Unknown report backend: {backend}")
+
+    @pyqtSlot(bool)
+    def select_report_backend(self, use_qt):
+        """Switch between the Qt and matplotlib report backends."""
+        self.report_generator = self.create_report_generator('qt' if use_qt else 'matplotlib')
+
     def update_plots(self):
         """Update the ECG plots with new data."""
         if self.ble_worker is not None:
@@ -148,6 +204,13 @@ class AppMainWindow(QMainWindow):
                 except (AttributeError, IndexError):
                     pass  # Handle cases where data might not be available yet
 
+    def start_relay(self):
+        """Start the local relay for bedside and nurses' station viewers."""
+        if RELAY_ENABLED:
+            self.relay = ECGRelayServer()
+            self.relay.error_signal.connect(self.handle_error_message)
+            self.relay.start()
+
     @pyqtSlot()
     def scan_devices(self):
         """Scan and connect to BLE devices."""
@@ -155,9 +218,11 @@ class AppMainWindow(QMainWindow):
             self.ble_worker.terminate()
             self.ble_worker.wait()
         
-        self.ble_worker = BLEWorker(TARGET_ADDRESS, CHANNEL_UUIDS)
+        self.ble_worker = BLEWorker(TARGET_ADDRESS, CHANNEL_UUIDS, self.patient_data, self.relay)
         self.ble_worker.connection_status_signal.connect(self.handle_connection_status)
         self.ble_worker.error_signal.connect(self.handle_error_message)
+        self.ble_worker.mains_noise_signal.connect(self.handle_mains_noise)
+        self.ble_worker.quality_signal.connect(self.handle_signal_quality)
         self.ble_worker.start()
 
     @pyqtSlot(bool)
@@ -174,16 +239,38 @@ class AppMainWindow(QMainWindow):
         self.device_connection_dialog.update_status(message)
         QTimer.singleShot(3000, self.device_connection_dialog.close)
 
+    @pyqtSlot(int, object)
+    def handle_mains_noise(self, frequency, noise):
+        """Show the detected mains frequency and the noisiest channel."""
+        channel = int(np.argmax(noise))
+        self.mains_label.setText(
+            f"Red eléctrica: {frequency} Hz | Ruido máx: {noise[channel]:.0f} (canal {channel + 1})"
+        )
+
+    @pyqtSlot(object)
+    def handle_signal_quality(self, statuses):
+        """Highlight plots of bad leads and list every bad channel."""
+        for i, plot_widget in enumerate(self.plot_widgets):
+            plot_widget.setBackground('w' if statuses[i] == 'ok' else QUALITY_BAD_BACKGROUND)
+        bad = [f"canal {i + 1} ({status})" for i, status in enumerate(statuses) if status != 'ok']
+        self.quality_label.setText(f"Derivaciones con problemas: {', '.join(bad)}" if bad else "")
+
     @pyqtSlot()
     def generate_report(self):
         """Generate ECG report."""
+        # Read latest data from all channels, which ends now
+        sample_count = self.report_generator.sample_count
+        self.generate_report_from_data(self.file_manager.read_all_last_values(sample_count), None,
+                                       time.time() - sample_count / SAMPLING_RATE)
+
+    @pyqtSlot(dict, object, float)
+    def generate_report_from_data(self, channel_data, patient_data=None, start_time=None):
+        """Generate ECG report from the given channel data, starting at start_time (defaults to now)."""
         try:
-            # Read latest data from all channels
-            channel_data = self.file_manager.read_all_last_values()
-            
             # Generate report
             output_path = self.file_manager.get_report_output_path("output.pdf")
-            self.report_generator.generate_report(output_path, channel_data, self.patient_data)
+            self.report_generator.generate_report(output_path, channel_data, patient_data or self.patient_data,
+                                                  start_time)
             
             # Show success message and open PDF
             QMessageBox.information(self, "Success", "Reporte generado exitosamente", QMessageBox.Ok)
@@ -192,16 +279,158 @@ class AppMainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error generando reporte: {str(e)}")
 
+    @pyqtSlot(object, int, int)
+    def generate_rhythm_report(self, session, start, count):
+        """Generate a paginated rhythm report for a window of a session in the background."""
+        output_path = self.file_manager.get_report_output_path(f"rhythm_{session.session_id}.pdf")
+        # Paginated rhythm reports are only implemented by the matplotlib backend
+        if self.rhythm_report_generator is None:
+            self.rhythm_report_generator = self.create_report_generator('matplotlib')
+        generator = self.rhythm_report_generator
+
+        def task(progress):
+            generator.generate_rhythm_report(output_path, session, start, count, progress=progress)
+
+        worker = self.start_session_task(task, output_path, "Generando reporte de ritmo...",
+                                         "Error generando reporte")
+        if worker is not None:
+            worker.result_signal.connect(self.handle_rhythm_report_ready)
+
+    @pyqtSlot(object)
+    def export_session(self, session):
+        """Export a session to Parquet in the background."""
+        output_path = self.exporter.get_export_path(session, 'parquet')
+        exporter = self.exporter
+
+        def task(progress):
+            exporter.export_parquet(session, output_path, progress=progress)
+
+        worker = self.start_session_task(task, output_path, "Exportando sesión...", "Error exportando sesión")
+        if worker is not None:
+            worker.result_signal.connect(self.handle_export_ready)
+
+    def start_session_task(self, task, output_path: str, label: str, error_message: str):
+        """
+        Run a long session job in a worker thread behind a cancellable progress dialog.
+
+        Parameters:
+        task: Callable taking a progress(done, total) keyword argument
+        output_path (str): File written by the task
+        label (str): Text shown in the progress dialog
+        error_message (str): Prefix of the error message if the task fails
+
+        Returns:
+        SessionTaskWorker: The started worker, or None if another job is still running
+        """
+        if self.session_task is not None and self.session_task.isRunning():
+            QMessageBox.warning(self, "Ocupado", "Espere a que termine la tarea en curso")
+            return None
+
+        progress = QProgressDialog(label, "Cancelar", 0, 100, self)
+        progress.setWindowModality(Qt.ApplicationModal)
+        progress.setAutoReset(False)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+
+        worker = SessionTaskWorker(task, output_path, error_message)
+        progress.canceled.connect(worker.requestInterruption)
+        worker.progress_signal.connect(self.handle_session_task_progress)
+        worker.cancelled_signal.connect(self.handle_session_task_cancelled)
+        worker.error_signal.connect(self.handle_session_task_error)
+        self.session_task = worker
+        self.session_task_progress = progress
+        worker.start()
+        return worker
+
+    @pyqtSlot(int, int)
+    def handle_session_task_progress(self, done, total):
+        """Show the progress of the running session job."""
+        self.session_task_progress.setValue(int(100 * done / max(1, total)))
+
+    def close_session_task_progress(self):
+        """Close the progress dialog of the finished session job."""
+        if self.session_task_progress is not None:
+            self.session_task_progress.close()
+            self.session_task_progress = None
+
+    @pyqtSlot(str)
+    def handle_rhythm_report_ready(self, output_path):
+        """Tell the user the rhythm report is ready and open it."""
+        self.close_session_task_progress()
+        QMessageBox.information(self, "Success", "Reporte generado exitosamente", QMessageBox.Ok)
+        QDesktopServices.openUrl(QUrl.fromLocalFile(output_path))
+
+    @pyqtSlot(str)
+    def handle_export_ready(self, output_path):
+        """Tell the user where the session was exported."""
+        self.close_session_task_progress()
+        QMessageBox.information(self, "Success", f"Sesión exportada a {output_path}", QMessageBox.Ok)
+
+    @pyqtSlot()
+    def handle_session_task_cancelled(self):
+        """Acknowledge a cancelled session job."""
+        self.close_session_task_progress()
+        self.statusBar().showMessage("Tarea cancelada", 5000)
+
+    @pyqtSlot(str)
+    def handle_session_task_error(self, message):
+        """Show why a session job failed."""
+        self.close_session_task_progress()
+        QMessageBox.critical(self, "Error", message)
+
     @pyqtSlot()
     def input_patient_data(self):
         """Open patient data input dialog."""
         patient_form = PatientDataForm(self)
         if patient_form.exec_() == patient_form.Accepted:
             self.patient_data = patient_form.get_patient_data()
+            if self.ble_worker is not None:
+                self.ble_worker.patient_data = self.patient_data
+                if self.ble_worker.session is not None:
+                    self.ble_worker.session.update_patient(self.patient_data)
+
+    @pyqtSlot()
+    def show_history(self):
+        """Open the session history viewer."""
+        history_dialog = SessionHistoryDialog(self.session_store, self.report_generator.sample_count, self)
+        history_dialog.report_requested.connect(self.generate_report_from_data)
+        history_dialog.rhythm_report_requested.connect(self.generate_rhythm_report)
+        history_dialog.export_requested.connect(self.export_session)
+        history_dialog.exec_()
     
+    @pyqtSlot()
+    def start_profiler(self):
+        """Profile the UI, BLE and relay threads for a few seconds."""
+        if self.profiler is not None and self.profiler.isRunning():
+            return
+
+        threads = [ProfiledThread('Qt main', threading.main_thread().ident)]
+        for name, worker in (('BLEWorker', self.ble_worker), ('Relay', self.relay)):
+            if worker is not None and worker.thread_ident is not None:
+                threads.append(ProfiledThread(name, worker.thread_ident, worker.loop))
+
+        self.profiler = SamplingProfiler(threads, PROFILER_DURATION)
+        self.profiler.result_signal.connect(self.handle_profile_ready)
+        self.profiler.error_signal.connect(self.handle_error_message)
+        self.profiler.start()
+        self.statusBar().showMessage(f"Perfilando durante {PROFILER_DURATION} s...", PROFILER_DURATION * 1000)
+
+    @pyqtSlot(str)
+    def handle_profile_ready(self, base_path):
+        """Tell the user where the captured profile was written."""
+        self.statusBar().showMessage(f"Perfil guardado en {base_path}.*", 10000)
+
     def closeEvent(self, event):
         """Handle application close event."""
         if self.ble_worker is not None:
             self.ble_worker.terminate()
             self.ble_worker.wait()
+        if self.relay is not None:
+            self.relay.stop()
+            self.relay.wait()
+        if self.profiler is not None:
+            self.profiler.wait()
+        if self.session_task is not None:
+            self.session_task.requestInterruption()
+            self.session_task.wait()
         event.accept()
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""On-demand sampling profiler for the running application."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..utils.constants import PROFILES_DIR, PROFILER_INTERVAL, PROFILER_LAG_PROBE_INTERVAL
+
+
+class ProfiledThread:
+    """A thread to sample, with the asyncio loop it runs if any."""
+
+    __slots__ = ('name', 'ident', 'loop')
+
+    def __init__(self, name: str, ident: int, loop: asyncio.AbstractEventLoop = None):
+        self.name = name
+        self.ident = ident
+        self.loop = loop
+
+
+async def probe_loop_lag(duration: float, interval: float = PROFILER_LAG_PROBE_INTERVAL) -> dict:
+    """
+    Measure how late an event loop wakes up sleeping tasks.
+
+    Runs inside the profiled loop. Every wakeup records the delay past the
+    requested sleep, which is how long ready callbacks waited behind
+    whatever was blocking the loop.
+
+    Parameters:
+    duration (float): How long to probe in seconds
+    interval (float): Sleep between wakeups in seconds
+
+    Returns:
+    dict: Lags in seconds and the pending tasks seen, by coroutine name
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + duration
+    lags = []
+    tasks = Counter()
+    while loop.time() < end:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - expected)
+        for task in asyncio.all_tasks(loop):
+            tasks[task.get_coro().__qualname__] += 1
+    return {'lags': lags, 'tasks': tasks}
+
+
+class SamplingProfiler(QThread):
+    """
+    Statistical profiler capturing stacks from several threads for a fixed time.
+
+    The sampler only exists while a capture runs, so there is no cost when
+    not profiling. Each tick reads the current frame of every profiled
+    thread with sys._current_frames(); threads running an asyncio loop also
+    get a lag probe scheduled on that loop. Results are written as a
+    speedscope profile, collapsed stacks and an asyncio latency summary.
+    """
+
+    result_signal = pyqtSignal(str)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, threads: list, duration: float, interval: float = PROFILER_INTERVAL):
+        super().__init__()
+        self.threads = threads
+        self.duration = duration
+        self.interval = interval
+
+    def run(self):
+        """Capture for the configured duration and write the results."""
+        try:
+            probes = {
+                thread.name: asyncio.run_coroutine_threadsafe(probe_loop_lag(self.duration), thread.loop)
+                for thread in self.threads if thread.loop is not None and thread.loop.is_running()
+            }
+            samples, elapsed = self.sample()
+            loop_stats = {}
+            for name, probe in probes.items():
+                try:
+                    loop_stats[name] = probe.result(timeout=self.duration + 5)
+                except Exception as e:
+                    loop_stats[name] = {'error': str(e)}
+
+            os.makedirs(PROFILES_DIR, exist_ok=True)
+            base_path = os.path.join(PROFILES_DIR, time.strftime('profile-%Y%m%d-%H%M%S'))
+            self.write_speedscope(base_path + '.speedscope.json', samples, elapsed)
+            self.write_collapsed(base_path + '.folded', samples)
+            self.write_loop_summary(base_path + '.asyncio.txt', loop_stats)
+            self.result_signal.emit(base_path)
+        except Exception as e:
+            self.error_signal.emit(f"Error capturando perfil: {e}")
+
+    def sample(self) -> tuple:
+        """
+        Sample thread stacks until the duration has elapsed.
+
+        Returns:
+        tuple: (samples, elapsed) where samples maps thread name to a list
+        of root-first stacks of (function, file, line)
+        """
+        names = {thread.ident: thread.name for thread in self.threads}
+        samples = {thread.name: [] for thread in self.threads}
+        start = time.perf_counter()
+        end = start + self.duration
+        while time.perf_counter() < end:
+            frames = sys._current_frames()
+            for ident, name in names.items():
+                frame = frames.get(ident)
+                if frame is not None:
+                    samples[name].append(self.frame_stack(frame))
+            del frames
+            time.sleep(self.interval)
+        return samples, time.perf_counter() - start
+
+    @staticmethod
+    def frame_stack(frame) -> tuple:
+        """Get the stack of a frame as root-first (function, file, line) entries."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def write_speedscope(self, path: str, samples: dict, elapsed: float):
+        """Write one sampled speedscope profile per thread."""
+        frames, frame_index, profiles = [], {}, []
+        for name, stacks in samples.items():
+            indexed = []
+            for stack in stacks:
+                row = []
+                for entry in stack:
+                    if entry not in frame_index:
+                        frame_index[entry] = len(frames)
+                        frames.append({'name': entry[0], 'file': entry[1], 'line': entry[2]})
+                    row.append(frame_index[entry])
+                indexed.append(row)
+            profiles.append({
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': elapsed,
+                'samples': indexed,
+                'weights': [elapsed / max(1, len(stacks))] * len(stacks),
+            })
+        with open(path, 'w') as file:
+            json.dump({
+                '$schema': 'https://www.speedscope.app/file-format-schema.json',
+                'shared': {'frames': frames},
+                'profiles': profiles,
+                'name': os.path.basename(path),
+                'exporter': 'ecg-app sampling profiler',
+            }, file)
+
+    @staticmethod
+    def write_collapsed(path: str, samples: dict):
+        """Write collapsed stacks, one 'thread;frame;...;frame count' line per stack."""
+        with open(path, 'w') as file:
+            for name, stacks in samples.items():
+                counts = Counter(';'.join([name] + [entry[0] for entry in stack]) for stack in stacks)
+                for line, count in counts.most_common():
+                    file.write(f'{line} {count}\n')
+
+    @staticmethod
+    def write_loop_summary(path: str, loop_stats: dict):
+        """Write event loop lag percentiles and the tasks seen on each loop."""
+        with open(path, 'w') as file:
+            for name, stats in loop_stats.items():
+                file.write(f'[{name}]\n')
+                if 'error' in stats:
+                    file.write(f"error: {stats['error']}\n\n")
+                    continue
+                lags = np.array(stats['lags']) * 1000
+                if len(lags):
+                    p50, p90, p99 = np.percentile(lags, [50, 90, 99])
+                    file.write(f'wakeups: {len(lags)}\n')
+                    file.write(f'lag ms: mean {lags.mean():.2f} p50 {p50:.2f} p90 {p90:.2f} '
+                               f'p99 {p99:.2f} max {lags.max():.2f}\n')
+                file.write('tasks (times seen pending):\n')
+                for task, count in stats['tasks'].most_common():
+                    file.write(f'  {count:6d}  {task}\n')
+                file.write('\n')
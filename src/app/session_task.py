@@ -0,0 +1,55 @@
+"""Background thread for long session jobs such as rhythm reports and exports."""
+
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    """Raised from a progress callback to stop a task the user cancelled."""
+
+
+class SessionTaskWorker(QThread):
+    """
+    Runs one long job over a recorded session outside the UI thread.
+
+    The job is a callable taking a progress(done, total) callback and
+    writing output_path. Progress is forwarded as a signal, and an
+    interruption request makes the next progress call abort the job and
+    remove the partial output.
+    """
+
+    progress_signal = pyqtSignal(int, int)
+    result_signal = pyqtSignal(str)
+    cancelled_signal = pyqtSignal()
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, task, output_path: str, error_message: str):
+        """
+        Parameters:
+        task: Callable taking a progress(done, total) keyword argument
+        output_path (str): File written by the task
+        error_message (str): Prefix of the message emitted if the task fails
+        """
+        super().__init__()
+        self.task = task
+        self.output_path = output_path
+        self.error_message = error_message
+
+    def report_progress(self, done: int, total: int):
+        """Forward progress from the task, stopping it if cancellation was requested."""
+        if self.isInterruptionRequested():
+            raise TaskCancelled()
+        self.progress_signal.emit(done, total)
+
+    def run(self):
+        """Run the task and emit its outcome."""
+        try:
+            self.task(progress=self.report_progress)
+            self.result_signal.emit(self.output_path)
+        except TaskCancelled:
+            if os.path.exists(self.output_path):
+                os.remove(self.output_path)
+            self.cancelled_signal.emit()
+        except Exception as e:
+            self.error_signal.emit(f"{self.error_message}: {e}")
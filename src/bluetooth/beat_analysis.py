@@ -0,0 +1,102 @@
+"""Beat segmentation and median beat computation for ECG leads."""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import find_peaks
+
+from ..utils.constants import (SAMPLING_RATE, MEDIAN_BEAT_REFERENCE_LEAD,
+                              MEDIAN_BEAT_PRE_SECONDS, MEDIAN_BEAT_POST_SECONDS)
+
+
+@dataclass
+class MedianBeats:
+    """Result of a median beat analysis."""
+    r_peaks: np.ndarray
+    beats: Dict[str, np.ndarray] = field(default_factory=dict)
+    heart_rate: float = 0.0
+    pre_samples: int = 0
+
+    @property
+    def beat_count(self) -> int:
+        """Number of beats that contributed to the medians."""
+        return len(self.r_peaks)
+
+
+class MedianBeatAnalyzer:
+    """Detects R-peaks and computes per-lead median beats without looping over beats."""
+
+    def __init__(self, sampling_rate: int = SAMPLING_RATE,
+                 reference_lead: str = MEDIAN_BEAT_REFERENCE_LEAD):
+        self.sampling_rate = sampling_rate
+        self.reference_lead = reference_lead
+        self.pre_samples = int(MEDIAN_BEAT_PRE_SECONDS * sampling_rate)
+        self.post_samples = int(MEDIAN_BEAT_POST_SECONDS * sampling_rate)
+        self.refine_samples = int(0.04 * sampling_rate)  # R-peak alignment search, +/- 40 ms
+
+    def detect_r_peaks(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Detect R-peaks in a filtered lead.
+
+        Parameters:
+        signal (np.ndarray): Filtered reference lead
+
+        Returns:
+        np.ndarray: Sample indices of the R-peaks
+        """
+        signal = np.asarray(signal, dtype=float)
+        if len(signal) < 3:
+            return np.empty(0, dtype=int)
+
+        # Polarity independent detection on the slope energy
+        energy = np.abs(np.gradient(signal - np.median(signal)))
+        threshold = 0.4 * np.percentile(energy, 99)
+        candidates, _ = find_peaks(energy, height=threshold, distance=int(0.3 * self.sampling_rate))
+        return self.align_r_peaks(signal, candidates)
+
+    def align_r_peaks(self, signal: np.ndarray, peaks: np.ndarray) -> np.ndarray:
+        """Move each peak to the largest absolute deflection within the refine window."""
+        k = self.refine_samples
+        peaks = peaks[(peaks >= k) & (peaks < len(signal) - k)]
+        if len(peaks) == 0:
+            return peaks
+        windows = sliding_window_view(np.abs(signal - np.median(signal)), 2 * k + 1)[peaks - k]
+        return peaks - k + np.argmax(windows, axis=1)
+
+    def analyze(self, lead_data: Dict[str, np.ndarray]) -> MedianBeats:
+        """
+        Compute the median beat of every lead.
+
+        Parameters:
+        lead_data (dict): Filtered samples keyed by lead name, all the same length
+
+        Returns:
+        MedianBeats: R-peaks, per-lead median beats and heart rate
+        """
+        names = list(lead_data)
+        leads = np.stack([np.asarray(lead_data[name], dtype=float) for name in names])
+        r_peaks = self.detect_r_peaks(lead_data[self.reference_lead])
+
+        # Keep only beats whose whole window lies inside the data
+        window = self.pre_samples + self.post_samples
+        r_peaks = r_peaks[(r_peaks >= self.pre_samples) &
+                          (r_peaks + self.post_samples <= leads.shape[1])]
+        if len(r_peaks) == 0:
+            return MedianBeats(r_peaks=r_peaks, pre_samples=self.pre_samples)
+
+        # (leads, beats, window) view of every beat, no copies until the median
+        segments = sliding_window_view(leads, window, axis=1)[:, r_peaks - self.pre_samples]
+        medians = np.median(segments, axis=1)
+
+        heart_rate = 0.0
+        if len(r_peaks) > 1:
+            heart_rate = 60.0 * self.sampling_rate / np.median(np.diff(r_peaks))
+
+        return MedianBeats(
+            r_peaks=r_peaks,
+            beats={name: medians[i] for i, name in enumerate(names)},
+            heart_rate=float(heart_rate),
+            pre_samples=self.pre_samples
+        )
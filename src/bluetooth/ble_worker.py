@@ -1,17 +1,23 @@
 """BLE worker for handling Bluetooth communication."""
 
 import asyncio
-import json
+import threading
 import numpy as np
 import websockets
 from PyQt5.QtCore import QThread, pyqtSignal
 from bleak import BleakClient
 
 from ..utils.constants import (SAMPLES_PER_BUFFER, BASELINE_WANDER_ALPHA, 
-                              WEBSOCKET_URL, WEBSOCKET_BUFFER_SIZE)
+                              WEBSOCKET_URL, WEBSOCKET_BUFFER_SIZE, UPLINK_FORMAT,
+                              QUALITY_RECORD_POLICY, QUALITY_UPLOAD_POLICY)
 from ..utils.helpers import process_24bit_data, apply_baseline_wander_removal
 from ..data.file_manager import ECGFileManager
-from ..data.models import ECGData
+from ..data.models import ECGSampleBuffer, PatientData
+from ..data.codec import ECGBlockCodec
+from ..data.session_store import ECGSessionStore
+from .relay_server import ECGRelayServer
+from .mains_filter import MainsNotchFilter, MainsNoiseMonitor
+from .signal_quality import SignalQualityMonitor
 
 
 class BLEWorker(QThread):
@@ -19,11 +25,16 @@ class BLEWorker(QThread):
     
     connection_status_signal = pyqtSignal(bool)
     error_signal = pyqtSignal(str)
+    mains_noise_signal = pyqtSignal(int, object)
+    quality_signal = pyqtSignal(object)
     
-    def __init__(self, address, channel_uuids):
+    def __init__(self, address, channel_uuids, patient_data: PatientData = None,
+                 relay: ECGRelayServer = None):
         super().__init__()
         self.address = address
         self.channel_uuids = channel_uuids
+        self.patient_data = patient_data
+        self.relay = relay
         
         # Initialize sample arrays for each channel
         self.samples_arrays = {}
@@ -38,8 +49,20 @@ class BLEWorker(QThread):
         self.buffer_idx = 0
         self.ws_url = WEBSOCKET_URL
         self.ws = None
-        self.channel_buffers = [[] for _ in range(8)]
+        self.sample_buffer = ECGSampleBuffer()
+        self.codec = ECGBlockCodec()
         self.file_manager = ECGFileManager()
+        self.session_store = ECGSessionStore()
+        self.session = None
+        self.mains_filter = MainsNotchFilter()
+        self.mains_monitor = MainsNoiseMonitor()
+        self.quality_monitor = SignalQualityMonitor()
+        self.quality_statuses = None
+        self.raw_frame = np.zeros((8, SAMPLES_PER_BUFFER))
+        # Channels that were bad at any point in the chunk being buffered for upload
+        self.upload_bad_channels = np.zeros(8, dtype=bool)
+        self.loop = None
+        self.thread_ident = None
     
     def get_samples_array(self, channel: int) -> np.ndarray:
         """Get samples array for a specific channel."""
@@ -52,6 +75,8 @@ class BLEWorker(QThread):
             hex_data = data.hex()
             data_bytes = bytes.fromhex(hex_data)
             data_array = process_24bit_data(data_bytes)
+            # Keep the raw ADC values for rail detection, baseline removal overwrites them
+            self.raw_frame[channel - 1, :len(data_array)] = data_array
 
             # Apply baseline wander removal
             self.samples_arrays[channel], self.last_data_previous[channel], self.last_y_previous[channel] = \
@@ -63,9 +88,6 @@ class BLEWorker(QThread):
                     BASELINE_WANDER_ALPHA
                 )
             
-            # Record the processed data to a file
-            self.file_manager.write_channel_data(channel, self.samples_arrays[channel])
-            
             self.buffer_idx += 1
             
             # Special handling for the last channel
@@ -74,22 +96,52 @@ class BLEWorker(QThread):
     
     async def handle_final_channel(self):
         """Handle processing after the final channel data is received."""
-        # Append samples to channel buffers
+        frame = np.stack([self.samples_arrays[i + 1] for i in range(8)])
+        
+        # Track powerline noise on the unfiltered frame and follow the detected mains frequency
+        if self.mains_monitor.update(frame):
+            self.mains_filter.set_frequency(self.mains_monitor.frequency)
+            self.mains_noise_signal.emit(self.mains_monitor.frequency, self.mains_monitor.noise.tolist())
+        
+        # Remove powerline interference from all channels at once
+        frame = self.mains_filter.process(frame)
         for i in range(8):
-            self.channel_buffers[i].extend(self.samples_arrays[i + 1].tolist())
+            self.samples_arrays[i + 1][:] = frame[i]
+            
+            # Record the processed data to a file
+            self.file_manager.write_channel_data(i + 1, self.samples_arrays[i + 1])
+        
+        # Flag flat, saturated or noisy leads and tell the UI when that changes
+        bad_channels = self.quality_monitor.update(frame, self.raw_frame)
+        statuses = self.quality_monitor.statuses()
+        if statuses != self.quality_statuses:
+            self.quality_statuses = statuses
+            self.quality_signal.emit(statuses)
+        all_bad = bad_channels.all()
+        
+        # Record the complete frame to the indexed session
+        if self.session is not None and not (all_bad and QUALITY_RECORD_POLICY == 'skip'):
+            self.session.append(frame.T, bad_channels=bad_channels)
+        
+        # Fan the frame out to local viewers
+        if self.relay is not None:
+            self.relay.publish(frame)
+        
+        # Append samples to the outgoing buffer
+        if not (all_bad and QUALITY_UPLOAD_POLICY == 'skip'):
+            self.sample_buffer.append(frame)
+            self.upload_bad_channels |= bad_channels
         
         # Send when we have at least the required buffer size
-        if len(self.channel_buffers[0]) >= WEBSOCKET_BUFFER_SIZE:
-            ecg_data = ECGData()
-            for i in range(8):
-                ecg_data.set_channel_data(i + 1, self.channel_buffers[i][:WEBSOCKET_BUFFER_SIZE])
-            
-            data_packet = ecg_data.to_websocket_packet(WEBSOCKET_BUFFER_SIZE)
-            await self.ws.send(json.dumps(data_packet))
-            
-            # Remove sent samples
-            for i in range(8):
-                self.channel_buffers[i] = self.channel_buffers[i][WEBSOCKET_BUFFER_SIZE:]
+        if len(self.sample_buffer) >= WEBSOCKET_BUFFER_SIZE:
+            ecg_data = self.sample_buffer.consume(WEBSOCKET_BUFFER_SIZE)
+            if UPLINK_FORMAT == 'codec':
+                await self.ws.send(ecg_data.to_compressed(self.codec, WEBSOCKET_BUFFER_SIZE,
+                                                          self.upload_bad_channels))
+            else:
+                await self.ws.send(ecg_data.to_json(WEBSOCKET_BUFFER_SIZE, self.upload_bad_channels))
+            # Samples left in the buffer all come from the current frame
+            self.upload_bad_channels[:] = bad_channels if len(self.sample_buffer) else False
         
         self.buffer_idx = 0
     
@@ -107,6 +159,7 @@ class BLEWorker(QThread):
             async with BleakClient(self.address) as client:
                 await client.connect()
                 if client.is_connected():
+                    self.session = self.session_store.create_session(self.patient_data)
                     self.connection_status_signal.emit(True)
                     print(f"Connected to {self.address}")
                     
@@ -134,4 +187,6 @@ class BLEWorker(QThread):
         """Run the BLE worker in its own event loop."""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        self.loop = loop
+        self.thread_ident = threading.get_ident()
         loop.run_until_complete(self.connect_to_ble_device())
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Streaming powerline interference removal and monitoring."""
+
+import numpy as np
+from scipy.signal import iirnotch, lfilter, lfilter_zi
+
+from ..utils.constants import (SAMPLING_RATE, ECG_CHANNEL_COUNT, MAINS_FREQUENCIES,
+                              MAINS_DEFAULT_FREQUENCY, NOTCH_QUALITY, MAINS_MONITOR_WINDOW,
+                              MAINS_MONITOR_INTERVAL, MAINS_BAND_WIDTH, MAINS_SWITCH_RATIO)
+
+
+class MainsNotchFilter:
+    """Streaming IIR notch applied to all channels as one block, keeping per-channel state."""
+
+    def __init__(self, frequency: int = MAINS_DEFAULT_FREQUENCY, channels: int = ECG_CHANNEL_COUNT,
+                 sampling_rate: int = SAMPLING_RATE):
+        self.channels = channels
+        self.sampling_rate = sampling_rate
+        self.frequency = None
+        self.zi = None
+        self.set_frequency(frequency)
+
+    def set_frequency(self, frequency: int):
+        """Retune the notch, restarting its state on the next block."""
+        if frequency == self.frequency:
+            return
+        self.b, self.a = iirnotch(frequency, NOTCH_QUALITY, fs=self.sampling_rate)
+        self.frequency = frequency
+        self.zi = None
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Filter a block of samples.
+
+        Parameters:
+        frame (np.ndarray): Samples with shape (channels, n)
+
+        Returns:
+        np.ndarray: Filtered samples with the same shape
+        """
+        if self.zi is None:
+            # Start from steady state at the first sample to avoid a step transient
+            self.zi = lfilter_zi(self.b, self.a)[np.newaxis, :] * frame[:, :1]
+        filtered, self.zi = lfilter(self.b, self.a, frame, axis=1, zi=self.zi)
+        return filtered
+
+
+class MainsNoiseMonitor:
+    """
+    Sliding-window spectral monitor for powerline noise.
+
+    Keeps the last MAINS_MONITOR_WINDOW samples of every channel and, once
+    per MAINS_MONITOR_INTERVAL samples, takes one windowed rFFT of the whole
+    block to estimate the mains frequency and the per-channel RMS noise.
+    """
+
+    def __init__(self, channels: int = ECG_CHANNEL_COUNT, sampling_rate: int = SAMPLING_RATE,
+                 frequency: int = MAINS_DEFAULT_FREQUENCY):
+        self.buffer = np.zeros((channels, MAINS_MONITOR_WINDOW))
+        self.write_index = 0
+        self.filled = 0
+        self.pending = 0
+        self.frequency = frequency
+        self.noise = np.zeros(channels)
+
+        self.window = np.hanning(MAINS_MONITOR_WINDOW)
+        # Parseval scaling from one-sided windowed spectrum to signal power
+        self.scale = 2.0 / (MAINS_MONITOR_WINDOW * np.sum(self.window ** 2))
+        frequencies = np.fft.rfftfreq(MAINS_MONITOR_WINDOW, 1 / sampling_rate)
+        self.bands = {
+            mains: np.abs(frequencies - mains) <= MAINS_BAND_WIDTH
+            for mains in MAINS_FREQUENCIES
+        }
+
+    def update(self, frame: np.ndarray) -> bool:
+        """
+        Add samples and re-estimate when an interval has elapsed.
+
+        Parameters:
+        frame (np.ndarray): Unfiltered samples with shape (channels, n)
+
+        Returns:
+        bool: True if a new estimate is available
+        """
+        n = min(frame.shape[1], MAINS_MONITOR_WINDOW)
+        end = self.write_index + n
+        if end <= MAINS_MONITOR_WINDOW:
+            self.buffer[:, self.write_index:end] = frame[:, -n:]
+        else:
+            split = MAINS_MONITOR_WINDOW - self.write_index
+            self.buffer[:, self.write_index:] = frame[:, -n:-n + split]
+            self.buffer[:, :end - MAINS_MONITOR_WINDOW] = frame[:, -n + split:]
+        self.write_index = end % MAINS_MONITOR_WINDOW
+        self.filled = min(MAINS_MONITOR_WINDOW, self.filled + n)
+        self.pending += frame.shape[1]
+
+        if self.filled < MAINS_MONITOR_WINDOW or self.pending < MAINS_MONITOR_INTERVAL:
+            return False
+        self.pending = 0
+        self.estimate()
+        return True
+
+    def estimate(self):
+        """Estimate the mains frequency and per-channel noise from the current window."""
+        block = np.roll(self.buffer, -self.write_index, axis=1)
+        block = block - block.mean(axis=1, keepdims=True)
+        power = np.abs(np.fft.rfft(block * self.window, axis=1)) ** 2 * self.scale
+        band_power = {mains: power[:, band].sum(axis=1) for mains, band in self.bands.items()}
+
+        # Only switch when the other band is clearly dominant across channels
+        totals = {mains: band.sum() for mains, band in band_power.items()}
+        strongest = max(totals, key=totals.get)
+        if strongest != self.frequency and totals[strongest] > MAINS_SWITCH_RATIO * totals[self.frequency]:
+            self.frequency = strongest
+        self.noise = np.sqrt(band_power[self.frequency])
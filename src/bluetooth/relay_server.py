@@ -0,0 +1,174 @@
+"""Local WebSocket relay that fans processed frames out to many viewers."""
+
+import asyncio
+import hmac
+import ipaddress
+import threading
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import websockets
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from ..utils.constants import (RELAY_HOST, RELAY_PORT, RELAY_TOKEN, RELAY_QUEUE_SIZE,
+                              RELAY_DECIMATION_LEVELS, RELAY_DROP_POLICIES)
+from ..data.models import ECGData
+
+
+class RelaySubscriber:
+    """Per-client relay state."""
+
+    __slots__ = ('queue', 'decimation', 'drop_policy', 'dropped')
+
+    def __init__(self, decimation: int, drop_policy: str, queue_size: int = RELAY_QUEUE_SIZE):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.decimation = decimation
+        self.drop_policy = drop_policy
+        self.dropped = 0
+
+    def offer(self, payload: str):
+        """Queue a payload without waiting, dropping per policy when full."""
+        if self.queue.full():
+            self.dropped += 1
+            if self.drop_policy == 'newest':
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(payload)
+
+
+class ECGRelayServer(QThread):
+    """
+    Embedded WebSocket server broadcasting frames to local subscribers.
+
+    Clients connect to ws://host:port/?token=T&decimation=N&policy=oldest|newest.
+    The token is checked whenever one is configured, and binding to
+    anything other than loopback is refused without one.
+    The server runs its own event loop in this thread. publish() only hands
+    the frame over to that loop, and each frame is then serialized once per
+    decimation level in use and offered to every subscriber's bounded queue.
+    A slow client only loses its own frames and never delays acquisition.
+    """
+
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, host: str = RELAY_HOST, port: int = RELAY_PORT, token: str = RELAY_TOKEN):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.token = token
+        self.subscribers = set()
+        self.loop = None
+        self.thread_ident = None
+        self.stop_requested = False
+        # Sample phase per decimation level, so decimation is continuous across frames
+        self._phases = {level: 0 for level in RELAY_DECIMATION_LEVELS}
+
+    @staticmethod
+    def parse_options(path: str) -> tuple:
+        """Get (decimation, drop_policy) from a request path, falling back to defaults."""
+        query = parse_qs(urlparse(path).query)
+        try:
+            decimation = int(query.get('decimation', ['1'])[0])
+        except ValueError:
+            decimation = 1
+        if decimation not in RELAY_DECIMATION_LEVELS:
+            decimation = 1
+        drop_policy = query.get('policy', [RELAY_DROP_POLICIES[0]])[0]
+        if drop_policy not in RELAY_DROP_POLICIES:
+            drop_policy = RELAY_DROP_POLICIES[0]
+        return decimation, drop_policy
+
+    @staticmethod
+    def is_loopback(host: str) -> bool:
+        """Check whether a bind address is only reachable from this machine."""
+        if host == 'localhost':
+            return True
+        try:
+            return ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            return False
+
+    def is_authorized(self, path: str) -> bool:
+        """Check the token in a request path against the configured one."""
+        if not self.token:
+            return True
+        token = parse_qs(urlparse(path).query).get('token', [''])[0]
+        return hmac.compare_digest(token.encode(), self.token.encode())
+
+    async def handle_client(self, websocket, path: str = None):
+        """Stream queued frames to one subscriber until it disconnects."""
+        path = path or getattr(websocket, 'path', '/')
+        if not self.is_authorized(path):
+            await websocket.close(code=1008, reason='Invalid token')
+            return
+        decimation, drop_policy = self.parse_options(path)
+        subscriber = RelaySubscriber(decimation, drop_policy)
+        self.subscribers.add(subscriber)
+        try:
+            while True:
+                await websocket.send(await subscriber.queue.get())
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, frame: np.ndarray):
+        """
+        Hand a frame to the relay loop. Safe to call from any thread.
+
+        Parameters:
+        frame (np.ndarray): Samples with shape (channels, n), not modified afterwards
+        """
+        if self.loop is not None and self.subscribers:
+            self.loop.call_soon_threadsafe(self.broadcast, frame)
+
+    def broadcast(self, frame: np.ndarray):
+        """Serialize a frame per decimation level and offer it to every subscriber."""
+        levels = {subscriber.decimation for subscriber in self.subscribers}
+        payloads = {}
+        for level in RELAY_DECIMATION_LEVELS:
+            phase = self._phases[level]
+            if level in levels:
+                decimated = frame[:, phase::level]
+                payloads[level] = ECGData(decimated).to_json(decimated.shape[1])
+            self._phases[level] = (phase - frame.shape[1]) % level
+
+        for subscriber in list(self.subscribers):
+            subscriber.offer(payloads[subscriber.decimation])
+
+    def stop(self):
+        """Stop the relay loop. Safe to call from any thread, also before the loop has started."""
+        self.stop_requested = True
+        loop = self.loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def run(self):
+        """Run the relay server in its own event loop."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        if not self.token and not self.is_loopback(self.host):
+            self.error_signal.emit(f"Relay server not started: a token is required to listen on {self.host}")
+            loop.close()
+            return
+        try:
+            server = loop.run_until_complete(websockets.serve(self.handle_client, self.host, self.port))
+        except OSError as e:
+            self.error_signal.emit(f"Relay server could not start: {e}")
+            loop.close()
+            return
+
+        # Publish the loop before checking the flag, so a concurrent stop() either sees
+        # the loop and schedules its stop, or has already set the flag
+        self.loop = loop
+        self.thread_ident = threading.get_ident()
+        if not self.stop_requested:
+            loop.run_forever()
+        self.loop = None
+
+        # Handlers idle on their queues would keep the server from closing
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
@@ -0,0 +1,87 @@
+"""Streaming per-channel signal quality and lead-off detection."""
+
+import numpy as np
+
+from ..utils.constants import (ECG_CHANNEL_COUNT, QUALITY_WINDOW_FRAMES, QUALITY_CLIP_LIMIT,
+                              QUALITY_RAIL_LIMIT, QUALITY_CLIP_RATIO, QUALITY_FLATLINE_AMPLITUDE,
+                              QUALITY_NOISE_LIMIT)
+
+# Status labels shown in the UI, in order of precedence
+QUALITY_OK = "ok"
+QUALITY_SATURATED = "saturada"
+QUALITY_FLATLINE = "plana"
+QUALITY_NOISY = "ruidosa"
+
+
+class SignalQualityMonitor:
+    """
+    Rolling quality metrics for all channels, updated once per frame.
+
+    Each frame is reduced to a few per-channel statistics in one
+    vectorized pass (extremes, clipped sample count and the median
+    absolute second difference as a high-frequency noise level). The last
+    QUALITY_WINDOW_FRAMES reductions are kept in small rings so the rolling
+    metrics never look at old samples again.
+    """
+
+    def __init__(self, channels: int = ECG_CHANNEL_COUNT, window_frames: int = QUALITY_WINDOW_FRAMES):
+        self.maxs = np.full((window_frames, channels), -np.inf)
+        self.mins = np.full((window_frames, channels), np.inf)
+        self.clipped = np.zeros((window_frames, channels))
+        self.samples = np.zeros(window_frames)
+        self.noise = np.zeros((window_frames, channels))
+        self.index = 0
+        self.filled = 0
+
+        self.amplitude = np.zeros(channels)
+        self.clip_ratio = np.zeros(channels)
+        self.noise_level = np.zeros(channels)
+        self.saturated = np.zeros(channels, dtype=bool)
+        self.flatline = np.zeros(channels, dtype=bool)
+        self.noisy = np.zeros(channels, dtype=bool)
+        self.bad = np.zeros(channels, dtype=bool)
+
+    def update(self, frame: np.ndarray, raw: np.ndarray = None) -> np.ndarray:
+        """
+        Fold a frame into the rolling metrics.
+
+        Parameters:
+        frame (np.ndarray): Processed samples with shape (channels, n)
+        raw (np.ndarray): Raw ADC samples of the same frame, checked against the 24-bit rails
+
+        Returns:
+        np.ndarray: Boolean mask of bad channels
+        """
+        i = self.index
+        self.maxs[i] = frame.max(axis=1)
+        self.mins[i] = frame.min(axis=1)
+        clipped = np.abs(frame) >= QUALITY_CLIP_LIMIT
+        if raw is not None:
+            clipped |= np.abs(raw) >= QUALITY_RAIL_LIMIT
+        self.clipped[i] = clipped.sum(axis=1)
+        self.samples[i] = frame.shape[1]
+        # np.partition is several times cheaper than np.median on blocks this small
+        second_difference = np.abs(frame[:, 2:] - 2 * frame[:, 1:-1] + frame[:, :-2])
+        middle = second_difference.shape[1] // 2
+        self.noise[i] = np.partition(second_difference, middle, axis=1)[:, middle]
+        self.index = (i + 1) % len(self.samples)
+        self.filled = min(self.filled + 1, len(self.samples))
+
+        # Unfilled slots hold neutral values, except for the noise median
+        self.amplitude = self.maxs.max(axis=0) - self.mins.min(axis=0)
+        self.clip_ratio = self.clipped.sum(axis=0) / self.samples.sum()
+        self.noise_level = np.partition(self.noise[:self.filled], self.filled // 2, axis=0)[self.filled // 2]
+
+        self.saturated = self.clip_ratio > QUALITY_CLIP_RATIO
+        self.flatline = self.amplitude < QUALITY_FLATLINE_AMPLITUDE
+        self.noisy = self.noise_level > QUALITY_NOISE_LIMIT
+        self.bad = self.saturated | self.flatline | self.noisy
+        return self.bad
+
+    def statuses(self) -> list:
+        """Get the status label of every channel."""
+        return [
+            QUALITY_SATURATED if saturated else QUALITY_FLATLINE if flatline else QUALITY_NOISY if noisy
+            else QUALITY_OK
+            for saturated, flatline, noisy in zip(self.saturated, self.flatline, self.noisy)
+        ]
@@ -0,0 +1,166 @@
+"""Lossless block codec for integer ECG samples."""
+
+import numpy as np
+
+from ..utils.constants import CODEC_PREDICTOR_ORDER, CODEC_BLOCK_SIZE
+
+HEADER_DTYPE = np.dtype([('channels', '<u4'), ('samples', '<u4'), ('order', 'u1'), ('block_size', 'u1'),
+                         ('bad_channels', '<u4')])
+
+# Largest block size that is a multiple of 8 and fits the uint8 header field
+MAX_BLOCK_SIZE = 248
+# One bit per channel in the bad_channels header field
+MAX_MASK_CHANNELS = 32
+# Samples must fit in 48 bits so order 2 residuals stay exact in float64 width estimation
+SAMPLE_LIMIT = 2 ** 47
+
+
+class ECGBlockCodec:
+    """
+    Compresses (channels, N) blocks of integer samples without loss.
+
+    Each channel is run through a fixed linear predictor (order 1 is a
+    plain delta, order 2 extrapolates the last two samples), the signed
+    residuals are zigzag mapped to unsigned values, and every run of
+    block_size residuals is bit-packed at the width of its largest value.
+    All stages work on the whole block at once; the only loop is over the
+    distinct bit widths present.
+
+    Packet layout: header (channels, samples, order, block_size and a
+    bad channel bitmask), one uint8 bit width per residual block, then the
+    packed residual bits.
+    """
+
+    def __init__(self, order: int = CODEC_PREDICTOR_ORDER, block_size: int = CODEC_BLOCK_SIZE):
+        if order not in (0, 1, 2):
+            raise ValueError(f"Unsupported predictor order: {order}")
+        if block_size % 8 or not 8 <= block_size <= MAX_BLOCK_SIZE:
+            raise ValueError(f"Block size must be a multiple of 8 from 8 to {MAX_BLOCK_SIZE}, got {block_size}")
+        self.order = order
+        self.block_size = block_size
+
+    def encode(self, block: np.ndarray, bad_channels: np.ndarray = None) -> bytes:
+        """
+        Encode a block of integer samples.
+
+        Parameters:
+        block (np.ndarray): Integer samples with shape (channels, N)
+        bad_channels (np.ndarray): Boolean mask of channels with bad signal, stored in the header
+
+        Returns:
+        bytes: The encoded packet
+        """
+        block = np.asarray(block)
+        if block.ndim != 2 or not np.issubdtype(block.dtype, np.integer):
+            raise ValueError(f"Expected a 2D integer block, got {block.dtype} {block.shape}")
+        if block.size and (block.min() < -SAMPLE_LIMIT or block.max() >= SAMPLE_LIMIT):
+            raise ValueError(f"Samples must be within [-2**47, 2**47), got {block.min()}..{block.max()}")
+        channels, samples = block.shape
+        mask = 0
+        if bad_channels is not None:
+            if channels > MAX_MASK_CHANNELS:
+                raise ValueError(f"Bad channel masks support up to {MAX_MASK_CHANNELS} channels")
+            mask = int(np.dot(np.asarray(bad_channels, dtype=np.int64), 1 << np.arange(channels)))
+        header = np.array([(channels, samples, self.order, self.block_size, mask)], dtype=HEADER_DTYPE)
+
+        # Prediction residuals, with samples before the block taken as zero
+        residuals = block.astype(np.int64)
+        for _ in range(self.order):
+            residuals = np.diff(residuals, axis=1, prepend=0)
+
+        # Zigzag: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+        values = ((residuals << 1) ^ (residuals >> 63)).view(np.uint64)
+
+        # Split each channel into whole blocks, zero padding the last one
+        n_blocks = -(-samples // self.block_size)
+        blocks = np.zeros((channels, n_blocks * self.block_size), dtype=np.uint64)
+        blocks[:, :samples] = values
+        blocks = blocks.reshape(channels * n_blocks, self.block_size)
+
+        widths = self._block_widths(blocks)
+        return header.tobytes() + widths.tobytes() + self._pack(blocks, widths)
+
+    def decode(self, packet: bytes) -> np.ndarray:
+        """
+        Decode a packet back to integer samples.
+
+        Parameters:
+        packet (bytes): Packet produced by encode
+
+        Returns:
+        np.ndarray: int64 samples with shape (channels, N)
+        """
+        header = np.frombuffer(packet, dtype=HEADER_DTYPE, count=1)[0]
+        channels, samples = int(header['channels']), int(header['samples'])
+        order, block_size = int(header['order']), int(header['block_size'])
+        n_blocks = -(-samples // block_size)
+
+        offset = HEADER_DTYPE.itemsize
+        widths = np.frombuffer(packet, dtype=np.uint8, count=channels * n_blocks, offset=offset)
+        payload = np.frombuffer(packet, dtype=np.uint8, offset=offset + widths.size)
+
+        values = np.zeros((channels * n_blocks, block_size), dtype='>u8')
+        for width, index, positions in self._byte_positions(widths, block_size):
+            # Left-pad every value to 64 bits and reassemble the big-endian words
+            bits = np.unpackbits(payload[positions], axis=1).reshape(-1, width)
+            words = np.zeros((len(bits), 64), dtype=np.uint8)
+            words[:, 64 - width:] = bits
+            values[index] = np.packbits(words, axis=1).view('>u8').reshape(-1, block_size)
+
+        values = values.reshape(channels, n_blocks * block_size)[:, :samples].astype(np.uint64).view(np.int64)
+        residuals = (values >> 1) ^ -(values & 1)
+        for _ in range(order):
+            residuals = np.cumsum(residuals, axis=1)
+        return residuals
+
+    @staticmethod
+    def bad_channels(packet: bytes) -> np.ndarray:
+        """
+        Read the bad channel mask of a packet without decoding the samples.
+
+        Parameters:
+        packet (bytes): Packet produced by encode
+
+        Returns:
+        np.ndarray: Boolean mask with one entry per channel
+        """
+        header = np.frombuffer(packet, dtype=HEADER_DTYPE, count=1)[0]
+        return (int(header['bad_channels']) >> np.arange(int(header['channels']))) & 1 == 1
+
+    def _block_widths(self, values: np.ndarray) -> np.ndarray:
+        """Get the bit width of the largest value in every residual block."""
+        peaks = values.max(axis=1)
+        # frexp gives the exponent e with peak = m * 2**e, 0.5 <= m < 1, i.e. the bit length.
+        # Exact because encode keeps peaks below 2**50
+        return np.frexp(peaks.astype(np.float64))[1].astype(np.uint8)
+
+    @staticmethod
+    def _byte_positions(widths: np.ndarray, block_size: int):
+        """
+        Group residual blocks by bit width.
+
+        A block of block_size values at w bits takes block_size * w / 8
+        whole bytes, so every block starts on a byte boundary.
+
+        Yields:
+        tuple: (width, block_indices, byte_positions) where byte_positions
+        has shape (n_blocks, block_size * width // 8)
+        """
+        sizes = widths.astype(np.int64) * block_size // 8
+        starts = np.cumsum(sizes) - sizes
+        for width in np.unique(widths):
+            if width == 0:
+                continue
+            index = np.flatnonzero(widths == width)
+            yield int(width), index, starts[index, np.newaxis] + np.arange(block_size * int(width) // 8)
+
+    def _pack(self, values: np.ndarray, widths: np.ndarray) -> bytes:
+        """Pack each residual block MSB first at its own bit width."""
+        sizes = widths.astype(np.int64) * self.block_size // 8
+        payload = np.zeros(int(sizes.sum()), dtype=np.uint8)
+        for width, index, positions in self._byte_positions(widths, self.block_size):
+            # Keep the low width bits of every big-endian 64-bit word
+            bits = np.unpackbits(values[index].astype('>u8').view(np.uint8), axis=1)
+            bits = bits.reshape(-1, 64)[:, 64 - width:].reshape(len(index), -1)
+            payload[positions] = np.packbits(bits, axis=1)
+        return payload.tobytes()
@@ -0,0 +1,155 @@
+"""Columnar export of recorded ECG sessions."""
+
+import os
+
+import numpy as np
+
+from ..utils.constants import EXPORTS_DIR, EXPORT_CHUNK_SAMPLES
+from .session_store import ECGSession
+from .codec import ECGBlockCodec
+from .models import ECGData
+
+# Chunk record in codec exports: packet length and time of the first sample
+CODEC_CHUNK_DTYPE = np.dtype([('length', '<u4'), ('timestamp', '<f8')])
+
+
+class ECGSessionExporter:
+    """
+    Streams a session into chunked, compressed columnar files.
+
+    Sessions are read and written one chunk at a time, so memory use is
+    bounded by the chunk size regardless of the recording length. Each
+    output has a float64 'timestamp' column (seconds since the epoch) and
+    one float32 column per channel.
+    """
+
+    def __init__(self, chunk_samples: int = EXPORT_CHUNK_SAMPLES):
+        self.chunk_samples = chunk_samples
+        os.makedirs(EXPORTS_DIR, exist_ok=True)
+
+    def get_export_path(self, session: ECGSession, extension: str) -> str:
+        """Get the default export path for a session."""
+        return os.path.join(EXPORTS_DIR, f'{session.session_id}.{extension}')
+
+    def iter_chunks(self, session: ECGSession, progress=None):
+        """
+        Iterate over a session in chunks.
+
+        Parameters:
+        session (ECGSession): Session to read
+        progress: Optional callback called as progress(samples_done, sample_count) after each chunk
+
+        Yields:
+        tuple: (timestamps, samples) where samples has shape (channels, n)
+        """
+        total = session.sample_count
+        for start in range(0, total, self.chunk_samples):
+            count = min(self.chunk_samples, total - start)
+            yield session.sample_times(start, count), session.read_window(start, count)
+            if progress is not None:
+                progress(start + count, total)
+
+    def export_parquet(self, session: ECGSession, output_path: str = None,
+                       compression: str = 'zstd', progress=None) -> str:
+        """
+        Export a session to Parquet, one row group per chunk.
+
+        Parameters:
+        session (ECGSession): Session to export
+        output_path (str): Destination file, defaults to the exports directory
+        compression (str): Parquet compression codec
+        progress: Optional callback called as progress(samples_done, sample_count)
+
+        Returns:
+        str: Path of the written file
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        output_path = output_path or self.get_export_path(session, 'parquet')
+        channel_names = [f'channel{i}' for i in range(1, session.channels + 1)]
+        schema = pa.schema(
+            [('timestamp', pa.float64())] + [(name, pa.float32()) for name in channel_names],
+            metadata={'sampling_rate': str(session.sampling_rate), 'session_id': session.session_id}
+        )
+
+        with pq.ParquetWriter(output_path, schema, compression=compression) as writer:
+            for timestamps, samples in self.iter_chunks(session, progress):
+                columns = [pa.array(timestamps)] + [pa.array(channel) for channel in samples]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        return output_path
+
+    def export_hdf5(self, session: ECGSession, output_path: str = None,
+                    complevel: int = 5, progress=None) -> str:
+        """
+        Export a session to an appendable HDF5 table through pandas.
+
+        Parameters:
+        session (ECGSession): Session to export
+        output_path (str): Destination file, defaults to the exports directory
+        complevel (int): Blosc compression level
+        progress: Optional callback called as progress(samples_done, sample_count)
+
+        Returns:
+        str: Path of the written file
+        """
+        import pandas as pd
+
+        # HDFStore skips empty appends, so there would be no table to attach metadata to
+        if session.sample_count == 0:
+            raise ValueError(f"Session {session.session_id} has no samples to export")
+
+        output_path = output_path or self.get_export_path(session, 'h5')
+        channel_names = [f'channel{i}' for i in range(1, session.channels + 1)]
+
+        with pd.HDFStore(output_path, mode='w', complevel=complevel, complib='blosc') as store:
+            for timestamps, samples in self.iter_chunks(session, progress):
+                frame = pd.DataFrame(np.ascontiguousarray(samples.T), columns=channel_names)
+                frame.insert(0, 'timestamp', timestamps)
+                store.append('ecg', frame, index=False)
+            store.get_storer('ecg').attrs.sampling_rate = session.sampling_rate
+        return output_path
+
+    def export_codec(self, session: ECGSession, output_path: str = None,
+                     codec: ECGBlockCodec = None, progress=None) -> str:
+        """
+        Export a session with the lossless sample codec.
+
+        The file is a sequence of chunk records, each a CODEC_CHUNK_DTYPE
+        header followed by one codec packet.
+
+        Parameters:
+        session (ECGSession): Session to export
+        output_path (str): Destination file, defaults to the exports directory
+        codec (ECGBlockCodec): Codec to use, defaults to the standard settings
+        progress: Optional callback called as progress(samples_done, sample_count)
+
+        Returns:
+        str: Path of the written file
+        """
+        codec = codec or ECGBlockCodec()
+        output_path = output_path or self.get_export_path(session, 'ecgz')
+
+        with open(output_path, 'wb') as file:
+            for timestamps, samples in self.iter_chunks(session, progress):
+                packet = ECGData(samples).to_compressed(codec)
+                file.write(np.array([(len(packet), timestamps[0])], dtype=CODEC_CHUNK_DTYPE).tobytes())
+                file.write(packet)
+        return output_path
+
+    @staticmethod
+    def iter_codec_file(path: str, codec: ECGBlockCodec = None):
+        """
+        Iterate over the chunks of a codec export.
+
+        Yields:
+        tuple: (timestamp, ECGData) for each chunk
+        """
+        codec = codec or ECGBlockCodec()
+        with open(path, 'rb') as file:
+            while True:
+                record = file.read(CODEC_CHUNK_DTYPE.itemsize)
+                if len(record) < CODEC_CHUNK_DTYPE.itemsize:
+                    return
+                length, timestamp = np.frombuffer(record, dtype=CODEC_CHUNK_DTYPE)[0]
+                yield float(timestamp), ECGData.from_compressed(file.read(int(length)), codec)
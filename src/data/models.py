@@ -1,8 +1,14 @@
 """Data models for the ECG application."""
 
+import json
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 
+import numpy as np
+
+from ..utils.constants import ECG_CHANNEL_COUNT
+from .codec import ECGBlockCodec
+
 
 @dataclass
 class PatientData:
@@ -38,38 +44,174 @@ class PatientData:
         )
 
 
-@dataclass
 class ECGData:
-    """ECG data container for all channels."""
-    channel1: list = None
-    channel2: list = None
-    channel3: list = None
-    channel4: list = None
-    channel5: list = None
-    channel6: list = None
-    channel7: list = None
-    channel8: list = None
-    
-    def __post_init__(self):
-        """Initialize empty lists if None."""
-        for i in range(1, 9):
-            if getattr(self, f'channel{i}') is None:
-                setattr(self, f'channel{i}', [])
-    
-    def get_channel_data(self, channel: int) -> list:
-        """Get data for specific channel."""
-        return getattr(self, f'channel{channel}', [])
-    
-    def set_channel_data(self, channel: int, data: list):
-        """Set data for specific channel."""
-        setattr(self, f'channel{channel}', data)
-    
-    def to_websocket_packet(self, sample_count: int = 250) -> Dict[str, Any]:
-        """Convert to WebSocket packet format."""
-        return {
+    """
+    ECG data container for all channels.
+
+    Samples live in a single (channels, N) float block and each channel is a
+    view into it, so slicing and serialization never build per-channel lists.
+    Channels may be shorter than the block: only the first lengths[i]
+    samples of row i are data, the rest is unused space.
+    """
+
+    __slots__ = ('block', 'lengths')
+
+    def __init__(self, block: Optional[np.ndarray] = None, channels: int = ECG_CHANNEL_COUNT, **channel_data):
+        """
+        Parameters:
+        block (np.ndarray): Samples with shape (channels, N), used without copying
+        channels (int): Number of channels when no block is given
+        channel_data: Optional 'channel1'...'channelN' keyword data
+        """
+        self.block = block if block is not None else np.zeros((channels, 0))
+        self.lengths = np.full(self.block.shape[0], self.block.shape[1], dtype=np.int64)
+        for name, data in channel_data.items():
+            if data is not None:
+                self.set_channel_data(int(name[len('channel'):]), data)
+
+    @property
+    def channels(self) -> int:
+        """Number of channels."""
+        return self.block.shape[0]
+
+    @property
+    def sample_count(self) -> int:
+        """Number of samples in the longest channel."""
+        return self.block.shape[1]
+
+    def get_channel_data(self, channel: int) -> np.ndarray:
+        """Get data for specific channel as a view into the block."""
+        if not 1 <= channel <= self.channels:
+            return np.empty(0)
+        return self.block[channel - 1, :self.lengths[channel - 1]]
+
+    def set_channel_data(self, channel: int, data):
+        """Set data for specific channel, growing the block if needed."""
+        data = np.asarray(data, dtype=float)
+        if len(data) > self.sample_count:
+            block = np.zeros((self.channels, len(data)))
+            block[:, :self.sample_count] = self.block
+            self.block = block
+        self.block[channel - 1, :len(data)] = data
+        self.lengths[channel - 1] = len(data)
+
+    def _rectangular_block(self, sample_count: Optional[int] = None) -> np.ndarray:
+        """Get the first sample_count samples of every channel, which must all have that many."""
+        count = self.sample_count if sample_count is None else min(sample_count, self.sample_count)
+        if np.any(self.lengths < count):
+            raise ValueError(f"Channels have different lengths {self.lengths.tolist()}, "
+                             f"binary packets need {count} samples in every channel")
+        return self.block[:, :count]
+
+    def to_websocket_packet(self, sample_count: int = 250,
+                            bad_channels: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Convert to WebSocket packet format, listing channels with bad signal if given."""
+        # One conversion for the whole block instead of one per channel
+        rows = self.block[:, :sample_count].tolist()
+        lengths = np.minimum(self.lengths, sample_count).tolist()
+        packet = {
             "type": "ecg_chunk",
-            "data": {
-                f"channel{i}": getattr(self, f'channel{i}')[:sample_count]
-                for i in range(1, 9)
-            }
-        }
\ No newline at end of file
+            "data": {f"channel{i + 1}": row[:length] for i, (row, length) in enumerate(zip(rows, lengths))}
+        }
+        if bad_channels is not None:
+            packet["bad_channels"] = [f"channel{i + 1}" for i in np.flatnonzero(bad_channels)]
+        return packet
+
+    def to_json(self, sample_count: int = 250, bad_channels: Optional[np.ndarray] = None) -> str:
+        """Serialize the WebSocket packet directly to a JSON string."""
+        return json.dumps(self.to_websocket_packet(sample_count, bad_channels))
+
+    def to_bytes(self, sample_count: Optional[int] = None) -> bytes:
+        """
+        Serialize to a compact binary packet.
+
+        The packet is a little-endian (channels, samples) uint32 header
+        followed by the samples as row-major float32.
+        """
+        block = self._rectangular_block(sample_count)
+        header = np.array(block.shape, dtype='<u4').tobytes()
+        return header + np.ascontiguousarray(block, dtype='<f4').tobytes()
+
+    @classmethod
+    def from_bytes(cls, packet: bytes) -> 'ECGData':
+        """Create ECGData from a binary packet without copying the samples."""
+        channels, samples = np.frombuffer(packet, dtype='<u4', count=2)
+        return cls(np.frombuffer(packet, dtype='<f4', offset=8).reshape(channels, samples))
+
+    def to_compressed(self, codec: ECGBlockCodec, sample_count: Optional[int] = None,
+                      bad_channels: Optional[np.ndarray] = None) -> bytes:
+        """
+        Serialize to a losslessly compressed packet.
+
+        Samples are rounded to whole ADC counts, the resolution of the
+        device, before encoding. A bad channel mask, if given, travels in
+        the packet header.
+        """
+        block = self._rectangular_block(sample_count)
+        return codec.encode(np.rint(block).astype(np.int64), bad_channels)
+
+    @classmethod
+    def from_compressed(cls, packet: bytes, codec: ECGBlockCodec) -> 'ECGData':
+        """Create ECGData from a compressed packet."""
+        return cls(codec.decode(packet).astype(float))
+
+    def __len__(self) -> int:
+        return self.sample_count
+
+
+class ECGSampleBuffer:
+    """
+    FIFO of multi-channel samples with O(1) chunk consumption.
+
+    Appends copy into a preallocated (channels, capacity) block and
+    consuming a chunk only advances a read index. Unread samples are moved
+    to the front only when the write position reaches the end.
+    """
+
+    __slots__ = ('block', 'read_index', 'write_index')
+
+    def __init__(self, channels: int = ECG_CHANNEL_COUNT, capacity: int = 4096):
+        self.block = np.zeros((channels, capacity))
+        self.read_index = 0
+        self.write_index = 0
+
+    def __len__(self) -> int:
+        return self.write_index - self.read_index
+
+    def append(self, frame: np.ndarray):
+        """
+        Append samples to the buffer.
+
+        Parameters:
+        frame (np.ndarray): Samples with shape (channels, n)
+        """
+        n = frame.shape[1]
+        if self.write_index + n > self.block.shape[1]:
+            pending = len(self)
+            if pending + n > self.block.shape[1]:
+                block = np.zeros((self.block.shape[0], max(2 * self.block.shape[1], pending + n)))
+            else:
+                block = self.block
+            block[:, :pending] = self.block[:, self.read_index:self.write_index]
+            self.block = block
+            self.read_index, self.write_index = 0, pending
+        self.block[:, self.write_index:self.write_index + n] = frame
+        self.write_index += n
+
+    def consume(self, count: int) -> ECGData:
+        """
+        Remove the oldest samples from the buffer.
+
+        The returned data is a view into the buffer and stays valid only
+        until the next append, so serialize it before appending again.
+
+        Parameters:
+        count (int): Number of samples to remove
+
+        Returns:
+        ECGData: The removed samples
+        """
+        count = min(count, len(self))
+        chunk = ECGData(self.block[:, self.read_index:self.read_index + count])
+        self.read_index += count
+        return chunk
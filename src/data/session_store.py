@@ -0,0 +1,314 @@
+"""Indexed, random-access storage for ECG recording sessions."""
+
+import json
+import os
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.constants import (SESSIONS_DIR, SESSION_CHANNELS, SAMPLING_RATE,
+                              PYRAMID_FACTOR, PYRAMID_LEVELS)
+from .models import PatientData
+
+SAMPLE_DTYPE = np.float32
+TIME_INDEX_DTYPE = np.dtype([('offset', '<i8'), ('timestamp', '<f8')])
+# Bad channel bitmask (bit i is channel i + 1) from an offset until the next entry
+QUALITY_INDEX_DTYPE = np.dtype([('offset', '<i8'), ('mask', '<u2')])
+
+SAMPLES_FILE = 'samples.bin'
+TIME_INDEX_FILE = 'time_index.bin'
+QUALITY_INDEX_FILE = 'quality_index.bin'
+METADATA_FILE = 'session.json'
+
+
+class ECGSession:
+    """
+    A single recording session on disk.
+
+    Samples are stored as a flat (N, 8) float32 block so any window can be
+    memory-mapped without parsing. A time index maps sample offsets to wall
+    clock time, and min/max pyramids allow zoomed-out views of long
+    recordings to be drawn without touching the raw samples.
+    """
+
+    def __init__(self, session_dir: str):
+        self.session_dir = session_dir
+        self.session_id = os.path.basename(session_dir)
+        with open(self._path(METADATA_FILE), 'r') as file:
+            self.metadata = json.load(file)
+        self.sampling_rate = self.metadata.get('sampling_rate', SAMPLING_RATE)
+        self.channels = self.metadata.get('channels', SESSION_CHANNELS)
+
+        # Partial bins carried between appends, one per pyramid level
+        self._pending_min = [np.empty((0, self.channels), SAMPLE_DTYPE) for _ in range(PYRAMID_LEVELS)]
+        self._pending_max = [np.empty((0, self.channels), SAMPLE_DTYPE) for _ in range(PYRAMID_LEVELS)]
+        quality_index = self._quality_index()
+        self._quality_mask = int(quality_index['mask'][-1]) if len(quality_index) else 0
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.session_dir, filename)
+
+    def _pyramid_path(self, level: int) -> str:
+        return self._path(f'pyramid_{level}.bin')
+
+    @staticmethod
+    def bin_size(level: int) -> int:
+        """Number of raw samples covered by one bin of a pyramid level."""
+        return PYRAMID_FACTOR ** level
+
+    @property
+    def sample_count(self) -> int:
+        """Number of samples per channel recorded so far."""
+        try:
+            size = os.path.getsize(self._path(SAMPLES_FILE))
+        except FileNotFoundError:
+            return 0
+        return size // (self.channels * SAMPLE_DTYPE().itemsize)
+
+    @property
+    def duration(self) -> float:
+        """Recorded duration in seconds."""
+        return self.sample_count / self.sampling_rate
+
+    @property
+    def start_time(self) -> float:
+        """Wall clock time of the first sample."""
+        return self.metadata['created']
+
+    def update_patient(self, patient_data: PatientData):
+        """Link the session to a patient."""
+        self.metadata['patient'] = patient_data.to_dict()
+        self._write_metadata()
+
+    def get_patient(self) -> PatientData:
+        """Get the patient linked to the session."""
+        return PatientData.from_dict(self.metadata.get('patient', {}))
+
+    def _write_metadata(self):
+        with open(self._path(METADATA_FILE), 'w') as file:
+            json.dump(self.metadata, file, indent=2)
+
+    def append(self, frame: np.ndarray, timestamp: Optional[float] = None,
+               bad_channels: Optional[np.ndarray] = None):
+        """
+        Append a block of samples to the session.
+
+        Parameters:
+        frame (np.ndarray): Samples with shape (n_samples, channels)
+        timestamp (float): Wall clock time of the first sample, defaults to now
+        bad_channels (np.ndarray): Boolean mask of channels with bad signal in this block
+        """
+        frame = np.ascontiguousarray(frame, dtype=SAMPLE_DTYPE)
+        if frame.ndim != 2 or frame.shape[1] != self.channels:
+            raise ValueError(f"Expected frame of shape (n, {self.channels}), got {frame.shape}")
+        if len(frame) == 0:
+            return
+
+        offset = self.sample_count
+        entry = np.array([(offset, time.time() if timestamp is None else timestamp)],
+                         dtype=TIME_INDEX_DTYPE)
+        with open(self._path(SAMPLES_FILE), 'ab') as file:
+            file.write(frame.tobytes())
+        with open(self._path(TIME_INDEX_FILE), 'ab') as file:
+            file.write(entry.tobytes())
+        if bad_channels is not None:
+            self._mark_quality(offset, bad_channels)
+
+        self._update_pyramids(frame, frame)
+
+    def _update_pyramids(self, mins: np.ndarray, maxs: np.ndarray):
+        """Fold new samples into each pyramid level, carrying partial bins."""
+        for level in range(PYRAMID_LEVELS):
+            pending_min = np.concatenate([self._pending_min[level], mins])
+            pending_max = np.concatenate([self._pending_max[level], maxs])
+            n_bins = len(pending_min) // PYRAMID_FACTOR
+            used = n_bins * PYRAMID_FACTOR
+            self._pending_min[level] = pending_min[used:]
+            self._pending_max[level] = pending_max[used:]
+            if n_bins == 0:
+                break
+
+            mins = pending_min[:used].reshape(n_bins, PYRAMID_FACTOR, self.channels).min(axis=1)
+            maxs = pending_max[:used].reshape(n_bins, PYRAMID_FACTOR, self.channels).max(axis=1)
+            with open(self._pyramid_path(level + 1), 'ab') as file:
+                file.write(np.stack([mins, maxs], axis=1).tobytes())
+
+    def _mark_quality(self, offset: int, bad_channels: np.ndarray):
+        """Record the bad channel mask from an offset, only when it changes."""
+        mask = int(np.dot(np.asarray(bad_channels, dtype=np.int64), 1 << np.arange(self.channels)))
+        if mask == self._quality_mask:
+            return
+        entry = np.array([(offset, mask)], dtype=QUALITY_INDEX_DTYPE)
+        with open(self._path(QUALITY_INDEX_FILE), 'ab') as file:
+            file.write(entry.tobytes())
+        self._quality_mask = mask
+
+    def _map(self, path: str, dtype, row_shape: tuple) -> np.ndarray:
+        """Memory-map a growing file as complete rows of the given shape."""
+        row_size = int(np.prod(row_shape)) * np.dtype(dtype).itemsize
+        try:
+            rows = os.path.getsize(path) // row_size
+        except FileNotFoundError:
+            rows = 0
+        if rows == 0:
+            return np.empty((0,) + row_shape, dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(rows,) + row_shape)
+
+    def read_window(self, start: int, count: int) -> np.ndarray:
+        """
+        Read a window of raw samples without loading the whole session.
+
+        Parameters:
+        start (int): First sample offset
+        count (int): Number of samples to read
+
+        Returns:
+        np.ndarray: Samples with shape (channels, n), n <= count
+        """
+        samples = self._map(self._path(SAMPLES_FILE), SAMPLE_DTYPE, (self.channels,))
+        start = max(0, start)
+        return np.array(samples[start:start + count]).T
+
+    def read_channel_dict(self, start: int, count: int) -> dict:
+        """Read a window in the channel dictionary format used by reports."""
+        window = self.read_window(start, count)
+        return {f'channel{i + 1}': window[i] for i in range(self.channels)}
+
+    def read_envelope(self, start: int, count: int, max_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read a min/max envelope of a window using the finest pyramid level
+        that fits within max_points bins.
+
+        Parameters:
+        start (int): First sample offset
+        count (int): Number of samples covered
+        max_points (int): Upper bound on the number of bins returned
+
+        Returns:
+        tuple: (bin_start_offsets, mins, maxs) with mins/maxs shaped (channels, n_bins)
+        """
+        start = max(0, start)
+        level = 0
+        while level < PYRAMID_LEVELS and count / self.bin_size(level) > max_points:
+            level += 1
+
+        if level == 0:
+            window = self.read_window(start, count)
+            offsets = np.arange(start, start + window.shape[1])
+            return offsets, window, window
+
+        size = self.bin_size(level)
+        bins = self._map(self._pyramid_path(level), SAMPLE_DTYPE, (2, self.channels))
+        first = start // size
+        last = -(-(start + count) // size)
+        block = np.array(bins[first:last])
+
+        # Samples after the last full bin are still pending in the recording session, or
+        # were never folded in if it stopped. They are less than one bin, build it from raw.
+        covered = first + len(block)
+        if covered < last:
+            tail = self.read_window(covered * size, size)
+            if tail.shape[1]:
+                block = np.concatenate([block, np.stack([tail.min(axis=1), tail.max(axis=1)])[np.newaxis]])
+        offsets = (first + np.arange(len(block))) * size
+        return offsets, block[:, 0, :].T, block[:, 1, :].T
+
+    def _quality_index(self) -> np.ndarray:
+        return self._map(self._path(QUALITY_INDEX_FILE), QUALITY_INDEX_DTYPE, ())
+
+    def bad_channels(self, start: int, count: int) -> np.ndarray:
+        """
+        Get the channels marked bad anywhere in a window.
+
+        Parameters:
+        start (int): First sample offset
+        count (int): Number of samples covered
+
+        Returns:
+        np.ndarray: Boolean mask with one entry per channel
+        """
+        index = self._quality_index()
+        if len(index) == 0:
+            return np.zeros(self.channels, dtype=bool)
+        # The entry in effect at the start, if any, through those starting inside the window
+        first = max(0, np.searchsorted(index['offset'], start, side='right') - 1)
+        last = np.searchsorted(index['offset'], start + count, side='left')
+        mask = np.bitwise_or.reduce(index['mask'][first:last].astype(np.int64))
+        return (mask >> np.arange(self.channels)) & 1 == 1
+
+    def _time_index(self) -> np.ndarray:
+        return self._map(self._path(TIME_INDEX_FILE), TIME_INDEX_DTYPE, ())
+
+    def sample_to_time(self, offset: int) -> float:
+        """Convert a sample offset to wall clock time."""
+        index = self._time_index()
+        if len(index) == 0:
+            return self.start_time + offset / self.sampling_rate
+        k = max(0, np.searchsorted(index['offset'], offset, side='right') - 1)
+        return float(index['timestamp'][k]) + (offset - int(index['offset'][k])) / self.sampling_rate
+
+    def sample_times(self, start: int, count: int) -> np.ndarray:
+        """Get the wall clock time of every sample in a window."""
+        offsets = np.arange(start, start + count, dtype=np.int64)
+        index = self._time_index()
+        if len(index) == 0:
+            return self.start_time + offsets / self.sampling_rate
+        k = np.maximum(0, np.searchsorted(index['offset'], offsets, side='right') - 1)
+        return index['timestamp'][k] + (offsets - index['offset'][k]) / self.sampling_rate
+
+    def time_to_sample(self, timestamp: float) -> int:
+        """Convert a wall clock time to the nearest sample offset."""
+        index = self._time_index()
+        if len(index) == 0:
+            return max(0, int(round((timestamp - self.start_time) * self.sampling_rate)))
+        k = max(0, np.searchsorted(index['timestamp'], timestamp, side='right') - 1)
+        offset = int(index['offset'][k]) + int(round((timestamp - float(index['timestamp'][k])) * self.sampling_rate))
+        return min(max(0, offset), self.sample_count)
+
+
+class ECGSessionStore:
+    """Creates, lists and opens recording sessions."""
+
+    def __init__(self, root_dir: str = SESSIONS_DIR):
+        self.root_dir = root_dir
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def create_session(self, patient_data: Optional[PatientData] = None) -> ECGSession:
+        """
+        Create a new empty session.
+
+        Parameters:
+        patient_data (PatientData): Patient to link the session to
+
+        Returns:
+        ECGSession: The new session, ready for appending
+        """
+        created = time.time()
+        session_id = time.strftime('%Y%m%d-%H%M%S', time.localtime(created)) + f'-{uuid.uuid4().hex[:6]}'
+        session_dir = os.path.join(self.root_dir, session_id)
+        os.makedirs(session_dir)
+        metadata = {
+            'session_id': session_id,
+            'created': created,
+            'sampling_rate': SAMPLING_RATE,
+            'channels': SESSION_CHANNELS,
+            'pyramid_factor': PYRAMID_FACTOR,
+            'patient': (patient_data or PatientData()).to_dict(),
+        }
+        with open(os.path.join(session_dir, METADATA_FILE), 'w') as file:
+            json.dump(metadata, file, indent=2)
+        return ECGSession(session_dir)
+
+    def list_sessions(self) -> List[str]:
+        """List session ids, newest first."""
+        return sorted(
+            (name for name in os.listdir(self.root_dir)
+             if os.path.exists(os.path.join(self.root_dir, name, METADATA_FILE))),
+            reverse=True
+        )
+
+    def open_session(self, session_id: str) -> ECGSession:
+        """Open an existing session for reading."""
+        return ECGSession(os.path.join(self.root_dir, session_id))
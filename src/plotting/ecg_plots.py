@@ -2,24 +2,81 @@
 
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
-import matplotlib.image as mpimg
 import numpy as np
 import datetime
-import io
-import os
+import functools
+import math
+from matplotlib.colors import to_rgb
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.offsetbox import AnnotationBbox, OffsetImage
 
-from ..utils.constants import ECG_LEADS, LOGO_REPORT_PATH, GRID_COLORS
+from ..utils.constants import (ECG_LEADS, GRID_COLORS, FILTER_ORDER,
+                              RHYTHM_LEAD, RHYTHM_STRIP_SECONDS, RHYTHM_STRIPS_PER_PAGE,
+                              RHYTHM_FILTER_MARGIN_SECONDS,
+                              REPORT_RENDER_MODE, REPORT_TRACE_DPI, GRID_PIXELS_PER_MINOR,
+                              REPORT_SAMPLES_COUNT, SAMPLING_RATE, MEDIAN_BEAT_ENABLED,
+                              MEDIAN_BEAT_WINDOW_SECONDS, REPORT_STRIP_SECONDS)
+from ..utils.helpers import minmax_decimate
+from .report_resources import report_resources
+from .report_layout import REPORT_TITLE, SPEED_CAPTION, header_columns, report_date
 from ..bluetooth.data_processor import ECGDataProcessor
+from ..bluetooth.beat_analysis import MedianBeatAnalyzer, MedianBeats
 from ..data.models import PatientData
+from ..data.session_store import ECGSession
+
+
+RENDER_MODES = ('vector', 'raster', 'decimated')
+# Above the axes and figure text, so raster traces are drawn last and together
+RASTER_TRACE_ZORDER = 10
+
+
+@functools.lru_cache(maxsize=None)
+def ecg_grid_image(x_cells: int, y_cells: int, x_cells_per_major: int, y_cells_per_major: int) -> np.ndarray:
+    """
+    Render ECG paper as an RGB image, cached per grid shape.
+
+    Parameters:
+    x_cells (int): Number of minor cells across
+    y_cells (int): Number of minor cells down
+    x_cells_per_major (int): Minor cells per major cell across
+    y_cells_per_major (int): Minor cells per major cell down
+
+    Returns:
+    numpy.ndarray: Read-only (height, width, 3) float image
+    """
+    width = x_cells * GRID_PIXELS_PER_MINOR + 1
+    height = y_cells * GRID_PIXELS_PER_MINOR + 1
+    image = np.ones((height, width, 3))
+
+    # Minor lines are drawn at half the major line strength
+    minor_color = (1 + np.array(to_rgb(GRID_COLORS['minor']))) / 2
+    major_color = np.array(to_rgb(GRID_COLORS['major']))
+    image[::GRID_PIXELS_PER_MINOR, :] = minor_color
+    image[:, ::GRID_PIXELS_PER_MINOR] = minor_color
+    image[::GRID_PIXELS_PER_MINOR * y_cells_per_major, :] = major_color
+    image[:, ::GRID_PIXELS_PER_MINOR * x_cells_per_major] = major_color
+
+    image.setflags(write=False)
+    return image
 
 
 class ECGReportGenerator:
     """Generates PDF reports of ECG data."""
     
-    def __init__(self):
+    def __init__(self, render_mode: str = REPORT_RENDER_MODE, median_beats: bool = MEDIAN_BEAT_ENABLED):
+        if render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode: {render_mode}")
         self.data_processor = ECGDataProcessor()
+        self.beat_analyzer = MedianBeatAnalyzer()
+        self.render_mode = render_mode
+        self.median_beats = median_beats
+
+        # Samples per channel the 12-lead report expects
+        self.sample_count = MEDIAN_BEAT_WINDOW_SECONDS * SAMPLING_RATE if median_beats else REPORT_SAMPLES_COUNT
     
-    def generate_report(self, output_path: str, channel_data: dict, patient_data: PatientData):
+    def generate_report(self, output_path: str, channel_data: dict, patient_data: PatientData,
+                        start_time: float = None):
         """
         Generate a PDF report of ECG leads with patient information.
         
@@ -27,126 +84,277 @@ class ECGReportGenerator:
         output_path (str): Path where the generated PDF will be saved
         channel_data (dict): Dictionary containing all channel data
         patient_data (PatientData): Patient information
+        start_time (float): Wall clock time of the first sample, defaults to now
         """
-        # Set up the PDF buffer
-        pdf_buffer = io.BytesIO()
-        pdf = PdfPages(pdf_buffer)
-
         # Set up the figure layout
         fig = plt.figure(figsize=(8.27, 11.69))  # A4 size
 
+        # Get lead data using the data processor
+        lead_data = {lead: self.data_processor.get_lead_data(lead, channel_data) for lead in ECG_LEADS}
+        median_beats = self.beat_analyzer.analyze(lead_data) if self.median_beats else None
+
         # Load and place logo
         self._add_logo(fig)
         
         # Add title and patient information
-        self._add_header_info(fig, patient_data)
+        heart_rate = median_beats.heart_rate if median_beats is not None and median_beats.heart_rate else None
+        self._add_header_info(fig, patient_data, heart_rate, start_time)
         
         # Generate ECG plots
-        self._generate_ecg_plots(fig, channel_data)
+        self._generate_ecg_plots(fig, lead_data, median_beats)
 
         # Adjust layout
         plt.tight_layout(w_pad=1, h_pad=0.5, rect=[0.03, 0.02, 0.97, 0.85])
 
-        # Save the figure to the PDF and close
-        pdf.savefig(fig)
-        pdf.close()
-
-        # Write buffer to file
-        pdf_buffer.seek(0)
-        with open(output_path, "wb") as f:
-            f.write(pdf_buffer.read())
+        # Save the figure straight to the PDF file and release it
+        with PdfPages(output_path) as pdf:
+            pdf.savefig(fig, dpi=REPORT_TRACE_DPI)
+        plt.close(fig)
     
     def _add_logo(self, fig):
         """Add logo to the figure."""
-        if os.path.exists(LOGO_REPORT_PATH):
-            logo = mpimg.imread(LOGO_REPORT_PATH)
-            fig.figimage(logo, xo=690, yo=1085)
+        logo = report_resources.logo()
+        if logo is not None:
+            # Anchor in figure fraction so the logo keeps its place and size at any save DPI
+            width_px = fig.get_figwidth() * fig.dpi
+            height_px = fig.get_figheight() * fig.dpi
+            fig.add_artist(AnnotationBbox(OffsetImage(logo, zoom=72 / fig.dpi),
+                                          (690 / width_px, 1085 / height_px),
+                                          xycoords='figure fraction', box_alignment=(0, 0),
+                                          frameon=False, pad=0))
     
-    def _add_header_info(self, fig, patient_data: PatientData):
+    def _add_header_info(self, fig, patient_data: PatientData, heart_rate: float = None,
+                         start_time: float = None):
         """Add header information to the figure."""
         # Add title
-        plt.figtext(0.045, 0.95, 'Reporte de 12 Derivadas', ha='left', va='center', 
-                   fontsize=16, fontname='DIN Alternate')
-        
-        # Prepare patient information
-        user_info = {
-            "Nombres": patient_data.first_name,
-            "Apellido": patient_data.last_name,
-            "Género": patient_data.gender,
-            "Edad": f"{patient_data.age} años",
-            "Estatura": f"{patient_data.height} cm",
-            "Peso": f"{patient_data.weight} kg",
-            "Ritmo Cardíaco": "60 bpm",
-            "Presión Sanguínea": "105/70 mmHg",
-        }
-
-        # Split user information into two columns
-        left_user_info = {k: user_info[k] for k in list(user_info)[:4]}
-        right_user_info = {k: user_info[k] for k in list(user_info)[4:]}
+        plt.figtext(0.045, 0.95, REPORT_TITLE, ha='left', va='center', 
+                   fontproperties=report_resources.font(16))
         
-        # Get current date
-        current_date = datetime.datetime.now().strftime("%B %d, %Y").title()
+        # Prepare patient information in two columns
+        left_user_info, right_user_info = header_columns(patient_data, heart_rate)
 
         # Add information to figure
-        plt.figtext(0.05, 0.90, '\n'.join(f"{k}: {v}" for k, v in left_user_info.items()), 
-                   ha='left', va='top', fontsize=10, fontname='DIN Alternate')
-        plt.figtext(0.955, 0.90, '\n'.join(f"{k}: {v}" for k, v in right_user_info.items()), 
-                   ha='right', va='top', fontsize=10, fontname='DIN Alternate')
-        plt.figtext(0.5, 0.83, "Velocidad: 25 mm/sec, Amplitud: 10 mm/mV", 
-                   ha='center', va='center', fontsize=8, fontname='DIN Alternate', color='gray')
-        plt.figtext(0.05, 0.93, f"Fecha: {current_date}", 
-                   ha='left', va='top', fontsize=10, fontname='DIN Alternate')
+        plt.figtext(0.05, 0.90, left_user_info, 
+                   ha='left', va='top', fontproperties=report_resources.font(10))
+        plt.figtext(0.955, 0.90, right_user_info, 
+                   ha='right', va='top', fontproperties=report_resources.font(10))
+        plt.figtext(0.5, 0.86, SPEED_CAPTION, 
+                   ha='center', va='center', fontproperties=report_resources.font(8), color='gray')
+        plt.figtext(0.05, 0.93, f"Fecha: {report_date(start_time, with_time=True)}", 
+                   ha='left', va='top', fontproperties=report_resources.font(10))
     
-    def _generate_ecg_plots(self, fig, channel_data: dict):
-        """Generate ECG plots for all leads."""
-        # Define the grid for the plots
-        grid_size = (6, 2)
-        plot_positions = [(i, j) for i in range(6) for j in range(2)]
-
-        # Define font properties
-        title_font = {
-            'family': 'DIN Alternate',
-            'color': 'black',
-            'weight': 'normal',
-            'size': 10,
-        }
-
+    def _generate_ecg_plots(self, fig, lead_data: dict, median_beats: MedianBeats = None):
+        """Generate ECG plots for all leads, with a median beat panel beside each strip if given."""
         # Define common axis limits
-        x_limit = (0, 750)
         y_limit = (-12000, 12000)
 
+        if median_beats is None:
+            # Define the grid for the plots
+            grid_size = (6, 2)
+            plot_positions = [(i, j) for i in range(6) for j in range(2)]
+            x_limit = (0, 750)
+        else:
+            # Each lead takes a two column strip followed by a one column median beat
+            grid_size = (6, 6)
+            plot_positions = [(i, 3 * j) for i in range(6) for j in range(2)]
+            strip_samples = int(REPORT_STRIP_SECONDS * SAMPLING_RATE)
+            x_limit = (0, strip_samples)
+            beat_limit = (0, self.beat_analyzer.pre_samples + self.beat_analyzer.post_samples)
+
         for i, lead in enumerate(ECG_LEADS):
             row, col = plot_positions[i]
-            ax = plt.subplot2grid(grid_size, (row, col), colspan=1)
-            
-            # Get lead data using the data processor
-            lead_data = self.data_processor.get_lead_data(lead, channel_data)
+            ax = plt.subplot2grid(grid_size, (row, col), colspan=1 if median_beats is None else 2)
             
             # Plot the data
-            ax.plot(lead_data, 'k-', linewidth=0.5)
-            ax.set_title(lead, fontdict=title_font)
-            
-            # Set axis limits
-            ax.set_xlim(x_limit)
-            ax.set_ylim(y_limit)
-            
-            # Remove tick labels
-            ax.set_xticklabels([])
-            ax.set_yticklabels([])
-            
-            # Configure grid
-            ax.grid(True, which='major', linestyle='-', linewidth=0.1, color=GRID_COLORS['major'])
-            ax.grid(True, which='minor', linestyle=':', linewidth=0.05, color=GRID_COLORS['minor'])
-            
-            # Set grid locators
-            ax.xaxis.set_major_locator(plt.MultipleLocator(50))
-            ax.xaxis.set_minor_locator(plt.MultipleLocator(10))
-            ax.yaxis.set_major_locator(plt.MultipleLocator(4000))
-            ax.yaxis.set_minor_locator(plt.MultipleLocator(1000))
+            self._plot_trace(ax, lead_data[lead][:x_limit[1]])
+            ax.set_title(lead, fontproperties=report_resources.font(10), color='black')
             
-            # Customize borders
-            border_width = 0.5
-            border_color = 'lightgray'
-            for spine in ax.spines.values():
-                spine.set_linewidth(border_width)
-                spine.set_edgecolor(border_color)
\ No newline at end of file
+            self._configure_ecg_axis(ax, x_limit, y_limit)
+
+            if median_beats is not None:
+                beat_ax = plt.subplot2grid(grid_size, (row, col + 2), colspan=1)
+                if lead in median_beats.beats:
+                    self._plot_trace(beat_ax, median_beats.beats[lead])
+                beat_ax.set_title("Mediana", fontproperties=report_resources.font(8), color='gray')
+                self._configure_ecg_axis(beat_ax, beat_limit, y_limit)
+
+    def _trace_xy(self, ax, data) -> tuple:
+        """Get the x/y data to draw for a trace in the current render mode."""
+        if self.render_mode != 'decimated':
+            return np.arange(len(data)), data
+        # One min/max pair per output pixel column at the trace DPI
+        n_bins = int(ax.get_position().width * ax.figure.get_figwidth() * REPORT_TRACE_DPI)
+        return minmax_decimate(data, n_bins)
+
+    def _plot_trace(self, ax, data):
+        """Draw a trace in the current render mode and return its line."""
+        if self.render_mode != 'raster':
+            line, = ax.plot(*self._trace_xy(ax, data), 'k-', linewidth=0.5)
+            return line
+
+        # Every rasterized run renders a full-page bitmap that the PDF keeps until it is
+        # closed. Drawn by the figure above all axes, the traces share a single run
+        # instead of one per axes.
+        line = Line2D(*self._trace_xy(ax, data), color='k', linewidth=0.5, rasterized=True,
+                      zorder=RASTER_TRACE_ZORDER, transform=ax.transData, clip_box=ax.bbox)
+        ax.figure.add_artist(line)
+        return line
+
+    def _configure_ecg_axis(self, ax, x_limit: tuple, y_limit: tuple):
+        """Apply the ECG paper grid and border style to an axis."""
+        # Set axis limits
+        ax.set_xlim(x_limit)
+        ax.set_ylim(y_limit)
+        
+        if self.render_mode == 'vector':
+            self._configure_vector_grid(ax)
+        else:
+            self._configure_image_grid(ax, x_limit, y_limit)
+        
+        # Customize borders
+        border_width = 0.5
+        border_color = 'lightgray'
+        for spine in ax.spines.values():
+            spine.set_linewidth(border_width)
+            spine.set_edgecolor(border_color)
+
+    def _configure_image_grid(self, ax, x_limit: tuple, y_limit: tuple):
+        """Draw the grid as a single cached background image instead of tick gridlines."""
+        # Same spacing as the vector grid locators
+        x_minor, x_major, y_minor, y_major = 10, 50, 1000, 4000
+        x_cells = math.ceil((x_limit[1] - x_limit[0]) / x_minor)
+        y_cells = math.ceil((y_limit[1] - y_limit[0]) / y_minor)
+        image = ecg_grid_image(x_cells, y_cells, x_major // x_minor, y_major // y_minor)
+
+        # Line k is the centre of pixel k * GRID_PIXELS_PER_MINOR, so extend by half a
+        # pixel on each side to keep exactly one minor cell per x_minor / y_minor units.
+        # The grid may overrun the limits by up to one cell, the axes clip it.
+        x_pixel = x_minor / GRID_PIXELS_PER_MINOR
+        y_pixel = y_minor / GRID_PIXELS_PER_MINOR
+        extent = (x_limit[0] - x_pixel / 2, x_limit[0] + x_cells * x_minor + x_pixel / 2,
+                  y_limit[0] - y_pixel / 2, y_limit[0] + y_cells * y_minor + y_pixel / 2)
+        ax.imshow(image, extent=extent, origin='lower',
+                  aspect='auto', interpolation='none', zorder=0)
+        ax.set_xlim(x_limit)
+        ax.set_ylim(y_limit)
+        ax.set_xticks([])
+        ax.set_yticks([])
+
+    def _configure_vector_grid(self, ax):
+        """Draw the grid as per-tick vector gridlines."""
+        # Remove tick labels
+        ax.set_xticklabels([])
+        ax.set_yticklabels([])
+        
+        # Configure grid
+        ax.grid(True, which='major', linestyle='-', linewidth=0.1, color=GRID_COLORS['major'])
+        ax.grid(True, which='minor', linestyle=':', linewidth=0.05, color=GRID_COLORS['minor'])
+        
+        # Set grid locators
+        ax.xaxis.set_major_locator(plt.MultipleLocator(50))
+        ax.xaxis.set_minor_locator(plt.MultipleLocator(10))
+        ax.yaxis.set_major_locator(plt.MultipleLocator(4000))
+        ax.yaxis.set_minor_locator(plt.MultipleLocator(1000))
+
+    def generate_rhythm_report(self, output_path: str, session: ECGSession, start: int, count: int,
+                               patient_data: PatientData = None, lead: str = RHYTHM_LEAD, progress=None):
+        """
+        Generate a paginated rhythm strip report for a window of a session.
+
+        Pages are rendered one at a time straight into the PDF file. Each page
+        reads only its own window from the session and the figure is reused,
+        so memory stays flat regardless of the number of pages. The figure is
+        not registered with pyplot, so reports can be generated from a worker
+        thread while the UI uses a Qt backend.
+
+        Parameters:
+        output_path (str): Path where the generated PDF will be saved
+        session (ECGSession): Recorded session to read from
+        start (int): First sample offset of the report
+        count (int): Number of samples covered by the report
+        patient_data (PatientData): Patient information, defaults to the session's patient
+        lead (str): ECG lead shown on every strip
+        progress: Optional callback called as progress(pages_done, page_count) after each page
+        """
+        if self.render_mode == 'raster':
+            # The PDF keeps every page's trace bitmap until it is closed, so memory would
+            # grow with the page count. Min/max decimated traces look the same at the trace DPI.
+            return ECGReportGenerator('decimated', self.median_beats).generate_rhythm_report(
+                output_path, session, start, count, patient_data, lead, progress)
+
+        patient_data = patient_data or session.get_patient()
+        strip_samples = RHYTHM_STRIP_SECONDS * session.sampling_rate
+        page_samples = strip_samples * RHYTHM_STRIPS_PER_PAGE
+        start = max(0, start)
+        count = max(0, min(count, session.sample_count - start))
+        page_count = max(1, -(-count // page_samples))
+
+        fig, strip_axes, lines, strip_labels, page_label = self._create_rhythm_page(
+            patient_data, lead, strip_samples, session.sample_to_time(start))
+
+        with PdfPages(output_path) as pdf:
+            for page in range(page_count):
+                page_start = start + page * page_samples
+                page_length = min(page_samples, start + count - page_start)
+                lead_data = self._read_rhythm_lead(session, lead, page_start, page_length)
+
+                # Pad the last page so every strip keeps the same time scale
+                padded = np.full(page_samples, np.nan)
+                padded[:len(lead_data)] = lead_data
+                for i, line in enumerate(lines):
+                    strip_start = page_start + i * strip_samples
+                    line.set_data(*self._trace_xy(strip_axes[i], padded[i * strip_samples:(i + 1) * strip_samples]))
+                    strip_time = datetime.datetime.fromtimestamp(session.sample_to_time(strip_start))
+                    # Full date so recordings crossing midnight stay unambiguous
+                    strip_labels[i].set_text(strip_time.strftime('%Y-%m-%d %H:%M:%S'))
+                page_label.set_text(f"Página {page + 1} de {page_count}")
+
+                pdf.savefig(fig, dpi=REPORT_TRACE_DPI)
+                if progress is not None:
+                    progress(page + 1, page_count)
+
+    def _create_rhythm_page(self, patient_data: PatientData, lead: str, strip_samples: int,
+                            start_time: float):
+        """Build the reusable rhythm page figure and return its updatable artists."""
+        fig = Figure(figsize=(8.27, 11.69))  # A4 size
+        self._add_logo(fig)
+
+        patient_name = f"{patient_data.first_name} {patient_data.last_name}".strip()
+        fig.text(0.045, 0.95, 'Registro de Ritmo', ha='left', va='center',
+                 fontproperties=report_resources.font(16))
+        fig.text(0.05, 0.93, f"Fecha: {report_date(start_time)}\nPaciente: {patient_name}\nDerivación: {lead}",
+                 ha='left', va='top', fontproperties=report_resources.font(10))
+        fig.text(0.5, 0.86, SPEED_CAPTION,
+                 ha='center', va='center', fontproperties=report_resources.font(8), color='gray')
+        page_label = fig.text(0.955, 0.03, "", ha='right', va='center',
+                              fontproperties=report_resources.font(8), color='gray')
+
+        strip_axes = []
+        lines = []
+        strip_labels = []
+        for i in range(RHYTHM_STRIPS_PER_PAGE):
+            ax = fig.add_subplot(RHYTHM_STRIPS_PER_PAGE, 1, i + 1)
+            strip_axes.append(ax)
+            line = self._plot_trace(ax, np.full(strip_samples, np.nan))
+            self._configure_ecg_axis(ax, (0, strip_samples), (-12000, 12000))
+            strip_labels.append(ax.set_title("", loc='left', fontproperties=report_resources.font(8)))
+            lines.append(line)
+
+        fig.tight_layout(h_pad=1, rect=[0.03, 0.05, 0.97, 0.84])
+        return fig, strip_axes, lines, strip_labels, page_label
+
+    def _read_rhythm_lead(self, session: ECGSession, lead: str, start: int, count: int) -> np.ndarray:
+        """Read and filter a single lead for one page window."""
+        if count <= 0:
+            return np.empty(0)
+
+        # Filter a margin of neighbouring data too, so page edges carry no filtfilt transients
+        margin = RHYTHM_FILTER_MARGIN_SECONDS * session.sampling_rate
+        read_start = max(0, start - margin)
+        channel_data = session.read_channel_dict(read_start, start - read_start + count + margin)
+
+        # filtfilt needs a few filter lengths of data to pad against
+        if len(channel_data['channel1']) <= 3 * (2 * FILTER_ORDER + 1):
+            return np.empty(0)
+        lead_data = self.data_processor.get_lead_data(lead, channel_data)
+        return lead_data[start - read_start:start - read_start + count]
@@ -0,0 +1,233 @@
+"""Qt-native ECG report engine drawing with QPainter onto a QPdfWriter."""
+
+import numpy as np
+from PyQt5.QtCore import Qt, QRectF, QMarginsF
+from PyQt5.QtGui import (QPdfWriter, QPainter, QPainterPath, QPageSize, QPen, QColor,
+                         QFont, QFontDatabase, QImage, QPolygonF)
+
+from ..utils.constants import (ECG_LEADS, LOGO_REPORT_PATH, GRID_COLORS, REPORT_FONT_FAMILIES,
+                              REPORT_QT_DPI, REPORT_SAMPLES_COUNT, SAMPLING_RATE,
+                              MEDIAN_BEAT_ENABLED, MEDIAN_BEAT_WINDOW_SECONDS, REPORT_STRIP_SECONDS)
+from ..utils.helpers import minmax_decimate, file_signature
+from ..bluetooth.data_processor import ECGDataProcessor
+from ..bluetooth.beat_analysis import MedianBeatAnalyzer, MedianBeats
+from ..data.models import PatientData
+from .report_layout import REPORT_TITLE, SPEED_CAPTION, header_columns, report_date
+
+# Plot area in page fractions, measured from the top left
+PLOT_AREA = (0.05, 0.17, 0.955, 0.98)  # left, top, right, bottom
+ROW_TITLE_HEIGHT = 0.018
+ROW_GAP = 0.008
+COLUMN_GAP = 0.03
+PANEL_GAP = 0.015
+Y_LIMIT = (-12000, 12000)
+
+
+def polyline_from_arrays(x: np.ndarray, y: np.ndarray) -> QPolygonF:
+    """Build a QPolygonF by writing coordinates straight into its buffer."""
+    polygon = QPolygonF(len(x))
+    buffer = polygon.data()
+    buffer.setsize(len(x) * 2 * np.dtype(np.float64).itemsize)
+    points = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+    points[:, 0] = x
+    points[:, 1] = y
+    return polygon
+
+
+class QtReportGenerator:
+    """Generates PDF reports of ECG data without matplotlib."""
+
+    def __init__(self, median_beats: bool = MEDIAN_BEAT_ENABLED, dpi: int = REPORT_QT_DPI):
+        self.data_processor = ECGDataProcessor()
+        self.beat_analyzer = MedianBeatAnalyzer()
+        self.median_beats = median_beats
+        self.dpi = dpi
+
+        # Samples per channel the 12-lead report expects
+        self.sample_count = MEDIAN_BEAT_WINDOW_SECONDS * SAMPLING_RATE if median_beats else REPORT_SAMPLES_COUNT
+
+        self._font_family = None
+        self._logo = None
+        self._logo_signature = None
+        self._grid_paths = {}
+
+    def generate_report(self, output_path: str, channel_data: dict, patient_data: PatientData,
+                        start_time: float = None):
+        """
+        Generate a PDF report of ECG leads with patient information.
+
+        Parameters:
+        output_path (str): Path where the generated PDF will be saved
+        channel_data (dict): Dictionary containing all channel data
+        patient_data (PatientData): Patient information
+        start_time (float): Wall clock time of the first sample, defaults to now
+        """
+        lead_data = {lead: self.data_processor.get_lead_data(lead, channel_data) for lead in ECG_LEADS}
+        median_beats = self.beat_analyzer.analyze(lead_data) if self.median_beats else None
+
+        writer = QPdfWriter(output_path)
+        writer.setPageSize(QPageSize(QPageSize.A4))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+        writer.setResolution(self.dpi)
+
+        painter = QPainter(writer)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            width, height = writer.width(), writer.height()
+            self._draw_logo(painter, width, height)
+            heart_rate = median_beats.heart_rate if median_beats is not None and median_beats.heart_rate else None
+            self._draw_header(painter, width, height, patient_data, heart_rate, start_time)
+            self._draw_ecg_plots(painter, width, height, lead_data, median_beats)
+        finally:
+            painter.end()
+
+    def _points(self, size: float) -> float:
+        """Convert a size in points to device pixels."""
+        return size * self.dpi / 72
+
+    def _font(self, size: float) -> QFont:
+        """Get the report font, resolving the fallback chain once."""
+        if self._font_family is None:
+            installed = set(QFontDatabase().families())
+            self._font_family = next((family for family in REPORT_FONT_FAMILIES if family in installed),
+                                     QFont().defaultFamily())
+        font = QFont(self._font_family)
+        font.setPointSizeF(size)
+        return font
+
+    def _draw_text(self, painter, x: float, y: float, text: str, size: float,
+                   alignment, color: str = 'black'):
+        """Draw text anchored at a pixel position with the given alignment."""
+        painter.setFont(self._font(size))
+        painter.setPen(QColor(color))
+        # Large box around the anchor so the alignment flags position the text
+        box = painter.device().width()
+        if alignment & Qt.AlignRight:
+            left = x - box
+        elif alignment & Qt.AlignHCenter:
+            left = x - box / 2
+        else:
+            left = x
+        if alignment & Qt.AlignBottom:
+            top = y - box
+        elif alignment & Qt.AlignVCenter:
+            top = y - box / 2
+        else:
+            top = y
+        painter.drawText(QRectF(left, top, box, box), int(alignment), text)
+
+    def _draw_logo(self, painter, width: int, height: int):
+        """Draw the logo at the same place as the matplotlib report."""
+        signature = file_signature(LOGO_REPORT_PATH)
+        if signature != self._logo_signature:
+            self._logo = QImage(LOGO_REPORT_PATH) if signature is not None else None
+            self._logo_signature = signature
+        if self._logo is None or self._logo.isNull():
+            return
+
+        # The logo is laid out at 100 dpi, anchored by its bottom left corner
+        scale = self.dpi / 100
+        logo_width = self._logo.width() * scale
+        logo_height = self._logo.height() * scale
+        left = 690 / 827 * width
+        bottom = (1 - 1085 / 1169) * height
+        painter.drawImage(QRectF(left, bottom - logo_height, logo_width, logo_height), self._logo)
+
+    def _draw_header(self, painter, width: int, height: int, patient_data: PatientData,
+                     heart_rate: float = None, start_time: float = None):
+        """Draw title and patient information."""
+        left_user_info, right_user_info = header_columns(patient_data, heart_rate)
+        self._draw_text(painter, 0.045 * width, 0.05 * height, REPORT_TITLE, 16,
+                        Qt.AlignLeft | Qt.AlignVCenter)
+        self._draw_text(painter, 0.05 * width, 0.07 * height, f"Fecha: {report_date(start_time, with_time=True)}", 10,
+                        Qt.AlignLeft | Qt.AlignTop)
+        self._draw_text(painter, 0.05 * width, 0.10 * height, left_user_info, 10,
+                        Qt.AlignLeft | Qt.AlignTop)
+        self._draw_text(painter, 0.955 * width, 0.10 * height, right_user_info, 10,
+                        Qt.AlignRight | Qt.AlignTop)
+        self._draw_text(painter, 0.5 * width, 0.14 * height, SPEED_CAPTION, 8,
+                        Qt.AlignHCenter | Qt.AlignVCenter, 'gray')
+
+    def _draw_ecg_plots(self, painter, width: int, height: int, lead_data: dict,
+                        median_beats: MedianBeats = None):
+        """Draw all leads in a 6 x 2 grid, with a median beat beside each strip if given."""
+        left, top, right, bottom = PLOT_AREA
+        row_height = (bottom - top) / 6
+        column_width = (right - left - COLUMN_GAP) / 2
+
+        if median_beats is None:
+            x_limit = (0, 750)
+        else:
+            x_limit = (0, int(REPORT_STRIP_SECONDS * SAMPLING_RATE))
+            beat_limit = (0, self.beat_analyzer.pre_samples + self.beat_analyzer.post_samples)
+
+        for i, lead in enumerate(ECG_LEADS):
+            row, col = divmod(i, 2)
+            cell_left = left + col * (column_width + COLUMN_GAP)
+            cell_top = top + row * row_height + ROW_TITLE_HEIGHT
+            cell_height = row_height - ROW_TITLE_HEIGHT - ROW_GAP
+
+            if median_beats is None:
+                strip = QRectF(cell_left * width, cell_top * height,
+                               column_width * width, cell_height * height)
+            else:
+                strip_width = (column_width - PANEL_GAP) * 2 / 3
+                strip = QRectF(cell_left * width, cell_top * height,
+                               strip_width * width, cell_height * height)
+                beat = QRectF((cell_left + strip_width + PANEL_GAP) * width, cell_top * height,
+                              (column_width - PANEL_GAP - strip_width) * width, cell_height * height)
+
+            self._draw_ecg_axis(painter, strip, x_limit, lead_data[lead][:x_limit[1]])
+            self._draw_text(painter, strip.center().x(), strip.top() - self._points(3), lead, 10,
+                            Qt.AlignHCenter | Qt.AlignBottom)
+
+            if median_beats is not None:
+                self._draw_ecg_axis(painter, beat, beat_limit, median_beats.beats.get(lead))
+                self._draw_text(painter, beat.center().x(), beat.top() - self._points(3), "Mediana", 8,
+                                Qt.AlignHCenter | Qt.AlignBottom, 'gray')
+
+    def _grid_paths_for(self, box_width: int, box_height: int, x_limit: tuple) -> tuple:
+        """Get cached (minor, major) grid paths in box coordinates."""
+        key = (box_width, box_height, x_limit)
+        if key not in self._grid_paths:
+            minor, major = QPainterPath(), QPainterPath()
+            x_scale = box_width / (x_limit[1] - x_limit[0])
+            y_scale = box_height / (Y_LIMIT[1] - Y_LIMIT[0])
+            # Same spacing as the matplotlib grid locators
+            for value in range(x_limit[0], x_limit[1] + 1, 10):
+                path = major if value % 50 == 0 else minor
+                path.moveTo((value - x_limit[0]) * x_scale, 0)
+                path.lineTo((value - x_limit[0]) * x_scale, box_height)
+            for value in range(Y_LIMIT[0], Y_LIMIT[1] + 1, 1000):
+                path = major if value % 4000 == 0 else minor
+                path.moveTo(0, (Y_LIMIT[1] - value) * y_scale)
+                path.lineTo(box_width, (Y_LIMIT[1] - value) * y_scale)
+            self._grid_paths[key] = (minor, major)
+        return self._grid_paths[key]
+
+    def _draw_ecg_axis(self, painter, box: QRectF, x_limit: tuple, data):
+        """Draw the ECG paper grid, border and trace for one axis."""
+        minor, major = self._grid_paths_for(int(box.width()), int(box.height()), x_limit)
+        painter.save()
+        painter.translate(box.topLeft())
+        painter.setClipRect(QRectF(0, 0, box.width(), box.height()))
+
+        grid_color = QColor(GRID_COLORS['major'])
+        painter.setPen(QPen(QColor(grid_color).lighter(110), self._points(0.05)))
+        painter.drawPath(minor)
+        painter.setPen(QPen(grid_color, self._points(0.1)))
+        painter.drawPath(major)
+
+        if data is not None and len(data):
+            x, y = minmax_decimate(data, int(box.width()))
+            finite = np.isfinite(y)
+            px = (x[finite] - x_limit[0]) * box.width() / (x_limit[1] - x_limit[0])
+            py = (Y_LIMIT[1] - y[finite]) * box.height() / (Y_LIMIT[1] - Y_LIMIT[0])
+            painter.setPen(QPen(QColor('black'), self._points(0.5)))
+            painter.drawPolyline(polyline_from_arrays(px, py))
+
+        painter.setClipping(False)
+        painter.setPen(QPen(QColor('lightgray'), self._points(0.5)))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF(0, 0, box.width(), box.height()))
+        painter.restore()
@@ -0,0 +1,44 @@
+"""Report content shared by the report backends."""
+
+import datetime
+
+from ..data.models import PatientData
+
+REPORT_TITLE = 'Reporte de 12 Derivadas'
+SPEED_CAPTION = "Velocidad: 25 mm/sec, Amplitud: 10 mm/mV"
+
+
+def report_date(timestamp: float = None, with_time: bool = False) -> str:
+    """Get the date of a wall clock time as shown on reports, defaulting to now, with the time if asked."""
+    moment = datetime.datetime.now() if timestamp is None else datetime.datetime.fromtimestamp(timestamp)
+    text = moment.strftime("%B %d, %Y").title()
+    return f"{text} {moment.strftime('%H:%M:%S')}" if with_time else text
+
+
+def header_columns(patient_data: PatientData, heart_rate: float = None) -> tuple:
+    """
+    Build the two patient information columns of the report header.
+
+    Parameters:
+    patient_data (PatientData): Patient information
+    heart_rate (float): Measured heart rate, if available
+
+    Returns:
+    tuple: (left_text, right_text) with one "Key: value" line per field
+    """
+    user_info = {
+        "Nombres": patient_data.first_name,
+        "Apellido": patient_data.last_name,
+        "Género": patient_data.gender,
+        "Edad": f"{patient_data.age} años",
+        "Estatura": f"{patient_data.height} cm",
+        "Peso": f"{patient_data.weight} kg",
+        "Ritmo Cardíaco": f"{heart_rate:.0f} bpm" if heart_rate else "60 bpm",
+        "Presión Sanguínea": "105/70 mmHg",
+    }
+
+    # Split user information into two columns
+    keys = list(user_info)
+    left = '\n'.join(f"{k}: {user_info[k]}" for k in keys[:4])
+    right = '\n'.join(f"{k}: {user_info[k]}" for k in keys[4:])
+    return left, right
@@ -0,0 +1,83 @@
+"""Process-wide cache of decoded report assets and resolved fonts."""
+
+from typing import Optional
+
+import matplotlib.image as mpimg
+import numpy as np
+from matplotlib import font_manager
+from matplotlib.font_manager import FontProperties
+
+from ..utils.constants import LOGO_REPORT_PATH, REPORT_FONT_FAMILIES
+from ..utils.helpers import file_signature
+
+
+class ReportResources:
+    """
+    Decodes the report logo and resolves the report font once per process.
+
+    Each entry remembers the signature of the file it came from and is
+    reloaded when that file changes, so replacing an asset on disk takes
+    effect on the next report without restarting the app.
+    """
+
+    def __init__(self, logo_path: str = LOGO_REPORT_PATH, font_families: list = REPORT_FONT_FAMILIES):
+        self.logo_path = logo_path
+        self.font_families = list(font_families)
+        self._logo = None
+        self._logo_signature = None
+        self._font_path = None
+        self._font_signature = None
+        self._fonts = {}
+
+    def logo(self) -> Optional[np.ndarray]:
+        """Get the decoded report logo, or None if the file is missing."""
+        signature = file_signature(self.logo_path)
+        if signature != self._logo_signature:
+            self._logo = mpimg.imread(self.logo_path) if signature is not None else None
+            self._logo_signature = signature
+        return self._logo
+
+    def font_path(self) -> str:
+        """Get the file of the first installed font in the fallback chain."""
+        if self._font_path is None or file_signature(self._font_path) != self._font_signature:
+            self._font_path = self._resolve_font_path()
+            self._font_signature = file_signature(self._font_path)
+            self._fonts.clear()
+        return self._font_path
+
+    def _resolve_font_path(self) -> str:
+        for family in self.font_families:
+            try:
+                return font_manager.findfont(FontProperties(family=family), fallback_to_default=False)
+            except ValueError:
+                continue
+        return font_manager.findfont(FontProperties())
+
+    def font(self, size: float) -> FontProperties:
+        """
+        Get reusable font properties for the report font.
+
+        The properties point straight at the resolved font file, so text
+        drawn with them skips matplotlib's family lookup.
+
+        Parameters:
+        size (float): Font size in points
+
+        Returns:
+        FontProperties: Shared font properties, do not modify
+        """
+        font_path = self.font_path()
+        if size not in self._fonts:
+            self._fonts[size] = FontProperties(fname=font_path, size=size)
+        return self._fonts[size]
+
+    def clear(self):
+        """Drop all cached resources."""
+        self._logo = None
+        self._logo_signature = None
+        self._font_path = None
+        self._font_signature = None
+        self._fonts.clear()
+
+
+report_resources = ReportResources()
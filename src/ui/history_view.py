@@ -0,0 +1,171 @@
+"""Scrollable history view for recorded ECG sessions."""
+
+import datetime
+import numpy as np
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                             QScrollBar, QPushButton)
+from PyQt5.QtCore import Qt, pyqtSignal
+import pyqtgraph as pg
+
+from ..data.session_store import ECGSessionStore
+from ..utils.constants import (SESSION_CHANNELS, HISTORY_MAX_POINTS, REPORT_SAMPLES_COUNT,
+                              PLOT_LIMITS, QUALITY_BAD_BACKGROUND)
+
+# Visible span choices (label, seconds)
+HISTORY_SPANS = [
+    ("3 s", 3),
+    ("10 s", 10),
+    ("1 min", 60),
+    ("10 min", 600),
+    ("1 h", 3600),
+    ("6 h", 21600),
+    ("24 h", 86400),
+]
+
+
+class SessionHistoryDialog(QDialog):
+    """Dialog for browsing any time window of a recorded session."""
+
+    report_requested = pyqtSignal(dict, object, float)
+    rhythm_report_requested = pyqtSignal(object, int, int)
+    export_requested = pyqtSignal(object)
+
+    def __init__(self, session_store: ECGSessionStore, report_sample_count: int = REPORT_SAMPLES_COUNT,
+                 parent=None):
+        super().__init__(parent)
+        self.session_store = session_store
+        self.report_sample_count = report_sample_count
+        self.session = None
+        self.setWindowTitle("Historial de Sesiones")
+        self.setGeometry(100, 100, 1024, 700)
+        self.setup_ui()
+        self.load_sessions()
+
+    def setup_ui(self):
+        """Set up the dialog layout."""
+        self.layout = QVBoxLayout(self)
+
+        # Session and span selection
+        self.controls_layout = QHBoxLayout()
+        self.session_input = QComboBox()
+        self.session_input.currentTextChanged.connect(self.select_session)
+        self.span_input = QComboBox()
+        self.span_input.addItems([label for label, _ in HISTORY_SPANS])
+        self.span_input.setCurrentIndex(1)
+        self.span_input.currentIndexChanged.connect(self.update_range)
+        self.time_label = QLabel("")
+        self.report_button = QPushButton('Generar Reporte')
+        self.report_button.clicked.connect(self.request_report)
+        self.rhythm_report_button = QPushButton('Reporte de Ritmo')
+        self.rhythm_report_button.clicked.connect(self.request_rhythm_report)
+        self.export_button = QPushButton('Exportar Parquet')
+        self.export_button.clicked.connect(self.export_session)
+
+        self.controls_layout.addWidget(QLabel('Sesión:'))
+        self.controls_layout.addWidget(self.session_input)
+        self.controls_layout.addWidget(QLabel('Ventana:'))
+        self.controls_layout.addWidget(self.span_input)
+        self.controls_layout.addStretch()
+        self.controls_layout.addWidget(self.time_label)
+        self.controls_layout.addWidget(self.report_button)
+        self.controls_layout.addWidget(self.rhythm_report_button)
+        self.controls_layout.addWidget(self.export_button)
+        self.layout.addLayout(self.controls_layout)
+
+        # One plot per recorded channel, sharing the x axis
+        self.plot_widgets = []
+        self.ecg_lines = []
+        for i in range(SESSION_CHANNELS):
+            plot_widget = pg.PlotWidget()
+            plot_widget.setBackground('w')
+            plot_widget.showGrid(x=True, y=True)
+            plot_widget.setYRange(PLOT_LIMITS['y'][0], PLOT_LIMITS['y'][1])
+            plot_widget.setMouseEnabled(x=False, y=False)
+            plot_widget.getPlotItem().hideAxis('bottom')
+            if self.plot_widgets:
+                plot_widget.setXLink(self.plot_widgets[0])
+            ecg_line = plot_widget.plot([], pen=pg.mkPen('k', width=1))
+            self.layout.addWidget(plot_widget)
+            self.plot_widgets.append(plot_widget)
+            self.ecg_lines.append(ecg_line)
+
+        # Scroll bar position is in seconds from the start of the session
+        self.scroll_bar = QScrollBar(Qt.Horizontal)
+        self.scroll_bar.valueChanged.connect(self.update_plots)
+        self.layout.addWidget(self.scroll_bar)
+
+        self.setLayout(self.layout)
+
+    def load_sessions(self):
+        """Populate the session selector."""
+        self.session_input.clear()
+        self.session_input.addItems(self.session_store.list_sessions())
+
+    def select_session(self, session_id: str):
+        """Open the selected session and show its beginning."""
+        if not session_id:
+            self.session = None
+            return
+        self.session = self.session_store.open_session(session_id)
+        self.update_range()
+
+    def span_seconds(self) -> int:
+        """Get the currently selected visible span in seconds."""
+        return HISTORY_SPANS[self.span_input.currentIndex()][1]
+
+    def update_range(self):
+        """Update the scroll bar range for the current session and span."""
+        if self.session is None:
+            return
+        span = self.span_seconds()
+        self.scroll_bar.setRange(0, max(0, int(self.session.duration) - span))
+        self.scroll_bar.setPageStep(span)
+        self.scroll_bar.setSingleStep(max(1, span // 10))
+        self.update_plots()
+
+    def window_bounds(self) -> tuple:
+        """Get the (start, count) sample window currently shown."""
+        rate = self.session.sampling_rate
+        return self.scroll_bar.value() * rate, self.span_seconds() * rate
+
+    def update_plots(self):
+        """Redraw the visible window from the session pyramids."""
+        if self.session is None:
+            return
+        start, count = self.window_bounds()
+        offsets, mins, maxs = self.session.read_envelope(start, count, HISTORY_MAX_POINTS)
+
+        # Interleave min/max so each bin is drawn as a vertical stroke
+        x = (np.repeat(offsets, 2) - start) / self.session.sampling_rate
+        for i, ecg_line in enumerate(self.ecg_lines):
+            y = np.column_stack([mins[i], maxs[i]]).ravel()
+            ecg_line.setData(x, y)
+        self.plot_widgets[0].setXRange(0, self.span_seconds(), padding=0)
+
+        # Highlight channels marked bad anywhere in the window
+        for plot_widget, bad in zip(self.plot_widgets, self.session.bad_channels(start, count)):
+            plot_widget.setBackground(QUALITY_BAD_BACKGROUND if bad else 'w')
+
+        timestamp = datetime.datetime.fromtimestamp(self.session.sample_to_time(start))
+        self.time_label.setText(timestamp.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def request_report(self):
+        """Request a report starting at the current position for the session's patient."""
+        if self.session is None:
+            return
+        start, _ = self.window_bounds()
+        self.report_requested.emit(self.session.read_channel_dict(start, self.report_sample_count),
+                                   self.session.get_patient(), self.session.sample_to_time(start))
+
+    def request_rhythm_report(self):
+        """Request a paginated rhythm report covering the visible window."""
+        if self.session is None:
+            return
+        start, count = self.window_bounds()
+        self.rhythm_report_requested.emit(self.session, start, count)
+
+    def export_session(self):
+        """Request a Parquet export of the selected session."""
+        if self.session is None:
+            return
+        self.export_requested.emit(self.session)
@@ -1,5 +1,7 @@
 """Configuration constants for the ECG application."""
 
+import os
+
 # BLE Configuration
 TARGET_ADDRESS = "6614D41F-1CB3-77FA-3E35-C5A446EA4E3F"
 CHANNEL_UUIDS = {
@@ -15,6 +17,7 @@ CHANNEL_UUIDS = {
 
 # ECG Configuration
 SAMPLING_RATE = 250
+ECG_CHANNEL_COUNT = 8
 SAMPLES_PER_BUFFER = 28
 PLOT_UPDATE_INTERVAL = 112  # milliseconds
 PLOT_BUFFER_SIZE = 375
@@ -48,4 +51,83 @@ REPORT_SAMPLES_COUNT = 750
 GRID_COLORS = {
     'major': 'lightgray',
     'minor': 'lightgray'
-}
\ No newline at end of file
+}
+# Session Store Configuration
+SESSIONS_DIR = "data_records/sessions"
+SESSION_CHANNELS = ECG_CHANNEL_COUNT
+PYRAMID_FACTOR = 8  # Samples per min/max bin at each pyramid level
+PYRAMID_LEVELS = 6  # Coarsest level bins 8**6 samples (~17 min at 250 Hz)
+HISTORY_MAX_POINTS = 2000  # Max envelope points drawn per channel in history view
+
+# Export Configuration
+EXPORTS_DIR = "exports"
+EXPORT_CHUNK_SAMPLES = 250 * 60  # One minute of samples per row group
+
+# Rhythm Report Configuration
+RHYTHM_LEAD = "II"
+RHYTHM_STRIP_SECONDS = 5
+RHYTHM_STRIPS_PER_PAGE = 6  # 30 s per page, 120 pages per hour
+RHYTHM_FILTER_MARGIN_SECONDS = 1  # Extra data filtered on each side of a page, then trimmed
+
+# Report Rendering Configuration
+# 'vector': full-resolution paths and per-tick gridlines
+# 'raster': cached grid image and traces rasterized at REPORT_TRACE_DPI
+# 'decimated': cached grid image and min/max-decimated vector traces
+REPORT_RENDER_MODE = "decimated"
+REPORT_TRACE_DPI = 300
+GRID_PIXELS_PER_MINOR = 8
+
+# Report Fonts, tried in order until one is installed
+REPORT_FONT_FAMILIES = ["DIN Alternate", "DIN", "Helvetica Neue", "Helvetica", "Arial", "DejaVu Sans"]
+
+# Median Beat Configuration
+MEDIAN_BEAT_ENABLED = True
+MEDIAN_BEAT_REFERENCE_LEAD = "II"
+MEDIAN_BEAT_PRE_SECONDS = 0.25  # Window start before the R-peak
+MEDIAN_BEAT_POST_SECONDS = 0.45  # Window end after the R-peak
+MEDIAN_BEAT_WINDOW_SECONDS = 10  # Data analysed for a 12-lead report
+REPORT_STRIP_SECONDS = 2.5
+
+# Local Relay Configuration
+RELAY_ENABLED = False
+RELAY_HOST = "127.0.0.1"  # Set to a ward network address to serve nurses' stations and tablets
+RELAY_TOKEN = os.environ.get("ECG_RELAY_TOKEN", "")  # Shared token, required off loopback
+RELAY_PORT = 8765
+RELAY_QUEUE_SIZE = 64  # Frames buffered per subscriber before dropping
+RELAY_DECIMATION_LEVELS = (1, 2, 4, 8)
+RELAY_DROP_POLICIES = ("oldest", "newest")
+
+# Report Backend Configuration
+REPORT_BACKEND = "matplotlib"
+REPORT_QT_DPI = 300
+
+# Powerline Interference Configuration
+MAINS_FREQUENCIES = (50, 60)
+MAINS_DEFAULT_FREQUENCY = 60
+NOTCH_QUALITY = 30
+MAINS_MONITOR_WINDOW = 512  # Samples per spectrum, ~0.5 Hz resolution at 250 Hz
+MAINS_MONITOR_INTERVAL = SAMPLING_RATE  # Samples between estimates
+MAINS_BAND_WIDTH = 1.0  # Hz either side of the mains frequency
+MAINS_SWITCH_RATIO = 2.0  # Other band must be this much stronger to switch notch
+
+# Sample Codec Configuration
+CODEC_PREDICTOR_ORDER = 2  # 0: none, 1: delta, 2: linear extrapolation
+CODEC_BLOCK_SIZE = 32  # Residuals packed at a shared bit width
+UPLINK_FORMAT = "json"  # "json" or "codec"
+
+# Profiler Configuration
+PROFILES_DIR = "profiles"
+PROFILER_DURATION = 10  # Seconds per capture
+PROFILER_INTERVAL = 0.005  # Seconds between stack samples
+PROFILER_LAG_PROBE_INTERVAL = 0.01  # Seconds between event loop lag probes
+
+# Signal Quality Configuration
+QUALITY_WINDOW_FRAMES = 18  # Frames of SAMPLES_PER_BUFFER samples, ~2 s
+QUALITY_CLIP_LIMIT = 0.98 * PLOT_LIMITS['y'][1]  # Processed signal counts
+QUALITY_RAIL_LIMIT = 2 ** 23 - 2 ** 16  # Raw 24-bit ADC counts
+QUALITY_CLIP_RATIO = 0.05  # Fraction of clipped samples that marks a saturated lead
+QUALITY_FLATLINE_AMPLITUDE = 50  # Peak-to-peak counts below which a lead is flat
+QUALITY_NOISE_LIMIT = 400  # Median |second difference| above which a lead is noisy
+QUALITY_RECORD_POLICY = "mark"  # "mark" or "skip" frames where every lead is bad
+QUALITY_UPLOAD_POLICY = "mark"  # "mark" or "skip" chunks where every lead is bad
+QUALITY_BAD_BACKGROUND = "#ffe5e5"
@@ -1,5 +1,6 @@
 """Helper functions for the ECG application."""
 
+import os
 import numpy as np
 from scipy.signal import butter, filtfilt
 from .constants import SAMPLING_RATE, LOWPASS_CUTOFF_FREQUENCY, FILTER_ORDER
@@ -75,4 +76,51 @@ def apply_baseline_wander_removal(data_array, samples_array, last_data_previous,
             data_array[i - 1] = data_array[i]
             samples_array[i - 1] = samples_array[i]
     
-    return samples_array, data_array[-1], samples_array[-1]
\ No newline at end of file
+    return samples_array, data_array[-1], samples_array[-1]
+
+def minmax_decimate(data, n_bins):
+    """
+    Decimate a trace to per-bin min/max pairs.
+
+    Keeping both extremes of every bin preserves peaks, so the trace looks the
+    same as the full-resolution one once a bin is no wider than a pixel.
+
+    Parameters:
+    data (numpy.ndarray): Trace samples, may contain NaN padding
+    n_bins (int): Maximum number of bins
+
+    Returns:
+    tuple: (x, y) arrays to plot, x in sample units
+    """
+    data = np.asarray(data, dtype=float)
+    if n_bins <= 0 or len(data) <= 2 * n_bins:
+        return np.arange(len(data)), data
+
+    bin_size = -(-len(data) // n_bins)
+    padded = np.full(bin_size * n_bins, np.nan)
+    padded[:len(data)] = data
+    bins = padded.reshape(n_bins, bin_size)
+
+    # fmin/fmax ignore NaN padding without warning on all-NaN bins
+    mins = np.fmin.reduce(bins, axis=1)
+    maxs = np.fmax.reduce(bins, axis=1)
+    x = np.repeat(np.arange(n_bins) * bin_size + (bin_size - 1) / 2, 2)
+    y = np.column_stack([mins, maxs]).ravel()
+    return x, y
+
+
+def file_signature(path):
+    """
+    Get a signature that changes whenever a file is modified.
+
+    Parameters:
+    path (str): File path
+
+    Returns:
+    tuple: (mtime_ns, size), or None if the file is missing
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
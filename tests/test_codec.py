@@ -0,0 +1,131 @@
+"""Round-trip tests for the lossless ECG block codec."""
+
+import numpy as np
+import pytest
+
+from src.data.codec import ECGBlockCodec, MAX_BLOCK_SIZE
+from src.data.exporter import ECGSessionExporter
+from src.data.models import ECGData
+from src.data.session_store import ECGSessionStore
+from benchmarks.synthetic import synthetic_ecg
+
+RAIL = 2 ** 23
+
+
+def ecg_like(seconds: float = 10, seed: int = 0) -> np.ndarray:
+    """Synthetic ECG in 24-bit counts, the same signal the benchmarks use, as an integer block."""
+    return synthetic_ecg(seconds, seed=seed).astype(np.int64)
+
+
+@pytest.mark.parametrize('order', [0, 1, 2])
+def test_round_trip_ecg(order):
+    codec = ECGBlockCodec(order)
+    block = ecg_like()
+    packet = codec.encode(block)
+    assert np.array_equal(codec.decode(packet), block)
+    assert len(packet) < block.size * 3
+
+
+@pytest.mark.parametrize('order', [0, 1, 2])
+def test_round_trip_rails(order):
+    codec = ECGBlockCodec(order)
+    block = ecg_like(seconds=1)
+    block[0, ::2] = RAIL - 1
+    block[0, 1::2] = -RAIL
+    block[1, :] = -RAIL
+    block[2, 5] = RAIL - 1
+    assert np.array_equal(codec.decode(codec.encode(block)), block)
+
+
+@pytest.mark.parametrize('order', [0, 1, 2])
+def test_round_trip_random_24bit(order):
+    codec = ECGBlockCodec(order)
+    block = np.random.default_rng(1).integers(-RAIL, RAIL, (8, 1000))
+    assert np.array_equal(codec.decode(codec.encode(block)), block)
+
+
+@pytest.mark.parametrize('shape', [(8, 0), (0, 0), (8, 1), (8, 31), (8, 33), (3, 257), (1, 999)])
+@pytest.mark.parametrize('order', [0, 1, 2])
+def test_round_trip_empty_and_odd_lengths(shape, order):
+    codec = ECGBlockCodec(order)
+    block = np.random.default_rng(2).integers(-5000, 5000, shape)
+    decoded = codec.decode(codec.encode(block))
+    assert decoded.shape == shape
+    assert np.array_equal(decoded, block)
+
+
+def test_round_trip_constant_block():
+    codec = ECGBlockCodec()
+    block = np.zeros((8, 100), dtype=np.int64)
+    assert np.array_equal(codec.decode(codec.encode(block)), block)
+
+
+@pytest.mark.parametrize('block_size', [8, 64, MAX_BLOCK_SIZE])
+def test_block_sizes(block_size):
+    codec = ECGBlockCodec(block_size=block_size)
+    block = ecg_like(seconds=3)
+    assert np.array_equal(codec.decode(codec.encode(block)), block)
+
+
+@pytest.mark.parametrize('block_size', [0, 12, 256])
+def test_invalid_block_size(block_size):
+    with pytest.raises(ValueError):
+        ECGBlockCodec(block_size=block_size)
+
+
+def test_invalid_order():
+    with pytest.raises(ValueError):
+        ECGBlockCodec(order=3)
+
+
+@pytest.mark.parametrize('value', [2 ** 47, -2 ** 47 - 1, 2 ** 62])
+def test_rejects_samples_out_of_range(value):
+    with pytest.raises(ValueError):
+        ECGBlockCodec().encode(np.array([[0, value]]))
+
+
+def test_accepts_samples_at_range_limits():
+    codec = ECGBlockCodec()
+    block = np.array([[2 ** 47 - 1, -2 ** 47, 2 ** 47 - 1, 0]])
+    assert np.array_equal(codec.decode(codec.encode(block)), block)
+
+
+def test_rejects_float_block():
+    with pytest.raises(ValueError):
+        ECGBlockCodec().encode(np.zeros((8, 10)))
+
+
+def test_ecg_data_round_trip():
+    codec = ECGBlockCodec()
+    block = ecg_like(seconds=1).astype(float)
+    data = ECGData.from_compressed(ECGData(block).to_compressed(codec), codec)
+    assert np.array_equal(data.block, block)
+
+
+def test_bad_channel_mask_in_header():
+    codec = ECGBlockCodec()
+    block = ecg_like(seconds=1)
+    bad = np.zeros(8, dtype=bool)
+    bad[[1, 7]] = True
+    packet = ECGData(block.astype(float)).to_compressed(codec, bad_channels=bad)
+    assert np.array_equal(codec.bad_channels(packet), bad)
+    assert np.array_equal(codec.decode(packet), block)
+    assert not codec.bad_channels(codec.encode(block)).any()
+
+
+def test_session_export_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    session = ECGSessionStore(str(tmp_path / 'sessions')).create_session()
+    samples = ecg_like(seconds=130)
+    # Appended in device-sized frames, as recorded by the BLE worker
+    for start in range(0, samples.shape[1], 28):
+        session.append(samples[:, start:start + 28].T, timestamp=1000.0 + start / 250)
+
+    exporter = ECGSessionExporter(chunk_samples=250 * 60)
+    path = exporter.export_codec(session)
+    chunks = list(exporter.iter_codec_file(path))
+
+    assert len(chunks) == 3
+    assert [timestamp for timestamp, _ in chunks] == pytest.approx([1000.0, 1060.0, 1120.0])
+    decoded = np.concatenate([data.block for _, data in chunks], axis=1)
+    assert np.array_equal(decoded, session.read_window(0, session.sample_count))